@@ -22,6 +22,7 @@ import argparse
 import asyncio
 import json
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
 
@@ -94,7 +95,7 @@ async def scrape_single_ota(
 
 async def run_batch(args):
     """Run batch scrape for all specified OTAs."""
-    start_time = datetime.now()
+    start_time = time.perf_counter()
 
     print("\n" + "=" * 60)
     print(f"🚀 Batch Scraper - {args.dest.upper()}")
@@ -154,7 +155,7 @@ async def run_batch(args):
             results.append(result)
 
     # Summary
-    elapsed = (datetime.now() - start_time).total_seconds()
+    elapsed = time.perf_counter() - start_time
 
     print("\n" + "=" * 60)
     print("📊 Results Summary")
@@ -25,7 +25,6 @@ Examples:
 """
 
 import argparse
-import asyncio
 import json
 import re
 import sys
@@ -38,7 +37,7 @@ except ImportError:
     sys.exit(1)
 
 from scrapers import detect_ota, get_parser, create_browser
-from scrapers.base import navigate_with_retry, safe_extract_text
+from scrapers.base import navigate_with_retry, safe_extract_text, run_async
 
 
 # OTA-specific listing URL builders
@@ -313,4 +312,4 @@ async def main():
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_async(main())
@@ -16,10 +16,20 @@ Supported OTAs:
 - Any URL with standard page structure
 
 Usage:
-    python scrape_package.py <url> [--refresh] [--quiet] [--json] [--no-db]
+    python scrape_package.py <url> [<url> ...] [output.json] [--refresh] [--reparse] [--shared-browser] [--concurrency N] [--quiet] [--json] [--no-db]
+    python scrape_package.py --stop-browser
+
+Several URLs are scraped in one browser session (one page per URL). With
+several URLs, output.json receives a JSON array of all their results.
 
 Options:
     --refresh   Bypass cache and force fresh scrape
+    --reparse   Re-run the parser on cached page text (for parser development)
+    --shared-browser  Reuse a long-lived headless Chromium over CDP (started on
+                first use, left running; skips browser startup on later runs)
+    --stop-browser    Stop the shared Chromium and exit
+    --concurrency N   Pages scraped at once when several URLs are given
+                (default: min(4, CPU count))
     --quiet     Suppress output
     --json      Also save result to JSON file (for debugging)
     --no-db     Skip Turso DB import (JSON-only mode)
@@ -34,6 +44,9 @@ Examples:
     # JSON only, no DB import
     python scrape_package.py "https://vacation.liontravel.com/search?..." output.json --no-db
 
+    # Batch: one browser launch for all URLs
+    python scrape_package.py "https://www.besttour.com.tw/itinerary/A" "https://www.besttour.com.tw/itinerary/B" --json
+
 Requirements:
     pip install playwright
     playwright install chromium
@@ -41,48 +54,156 @@ Requirements:
 
 import asyncio
 import json
+import os
 import sys
 from datetime import datetime
 
 try:
-    from playwright.async_api import async_playwright
+    import orjson
 except ImportError:
-    print("Playwright not installed. Run: pip install playwright && playwright install chromium")
-    sys.exit(1)
+    orjson = None
 
 from scrapers import detect_ota, get_parser, create_browser
 from scrapers.base import (
-    navigate_with_retry, scroll_page, safe_extract_text,
-    extract_generic_elements, extract_package_links,
+    navigate_with_retry, scroll_page, extract_page_snapshot, CONTENT_READY_SELECTOR,
+    extract_package_links, run_async,
+    connect_shared_browser, new_scrape_context, stop_shared_browser, now_iso,
 )
+from scrapers.cache import get_cache
 from scrapers.schema import ScrapeResult, validate_result
 
 
-async def scrape_package(url: str, use_cache: bool = True) -> dict:
+async def scrape_package(
+    url: str, use_cache: bool = True, reparse: bool = False, shared_browser: bool = False
+) -> dict:
     """Scrape package details from the given URL."""
-    source_id = detect_ota(url)
+    results = await scrape_packages(
+        [url], use_cache=use_cache, reparse=reparse, shared_browser=shared_browser
+    )
+    return results[0]
+
+
+# Past a handful of tabs, Chromium's per-host connection limits slow every page
+DEFAULT_CONCURRENCY = min(4, os.cpu_count() or 1)
+
+
+async def scrape_packages(
+    urls: list[str],
+    use_cache: bool = True,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    reparse: bool = False,
+    shared_browser: bool = False,
+) -> list[dict]:
+    """
+    Scrape several package URLs with a single browser launch.
+
+    Cached results are served before any browser starts (with `reparse`,
+    the parser re-runs on the cached page text). Each remaining URL gets its
+    own page in a shared context; at most `concurrency` pages are open at
+    once. Results are returned in the order of `urls`. With `shared_browser`,
+    the pages run in a long-lived Chromium reached over CDP.
+    """
+    done: dict[str, ScrapeResult] = {}
+    if use_cache:
+        done = _load_cached(urls, reparse)
+
+    pending = list(dict.fromkeys(url for url in urls if url not in done))
+    if pending:
+        scraped = await _scrape_in_browser(pending, use_cache, concurrency, shared_browser)
+        done.update(zip(pending, scraped))
+
+    # Return legacy dict format for backward compatibility
+    return [done[url].to_legacy_dict() for url in urls]
+
+
+def _load_cached(urls: list[str], reparse: bool) -> dict[str, ScrapeResult]:
+    """Return validated cache hits for known-OTA URLs, keyed by URL."""
+    cache = get_cache()
+    hits: dict[str, ScrapeResult] = {}
+    for url in urls:
+        source_id = detect_ota(url)
+        if not source_id or url in hits:
+            continue
+        result = cache.get(source_id, url)
+        if result is None:
+            continue
+        if reparse:
+            get_parser(source_id).reparse(result)
+        result.warnings.extend(validate_result(result))
+        hits[url] = result
+    return hits
+
+
+async def _scrape_in_browser(
+    urls: list[str], use_cache: bool, concurrency: int, shared_browser: bool = False
+) -> list[ScrapeResult]:
+    """Scrape URLs on one browser, one page per URL, bounded by `concurrency`."""
+    # Imported here so cache hits, --reparse and --stop-browser never load Playwright
+    try:
+        from playwright.async_api import async_playwright
+    except ImportError:
+        print("Playwright not installed. Run: pip install playwright && playwright install chromium")
+        sys.exit(1)
 
     async with async_playwright() as p:
-        browser, context, page = await create_browser(p)
+        if shared_browser:
+            browser = await connect_shared_browser(p)
+            context = await new_scrape_context(browser, block_resources=True)
+        else:
+            browser, context, page = await create_browser(p, block_resources=True)
+            await page.close()
+        sem = asyncio.Semaphore(concurrency)
+
+        async def scrape_one(url: str) -> ScrapeResult:
+            async with sem:
+                page = await context.new_page()
+                try:
+                    return await _scrape_on_page(page, url, use_cache)
+                except Exception as e:
+                    # One failing URL must not discard the others' results
+                    return _failed_result(url, e)
+                finally:
+                    await page.close()
 
         try:
-            if source_id:
-                # Use the dedicated parser
-                parser = get_parser(source_id)
-                result = await parser.scrape(page, url, use_cache=use_cache)
+            return await asyncio.gather(*(scrape_one(url) for url in urls))
+        finally:
+            if shared_browser:
+                # Leave the shared Chromium running for the next invocation
+                await context.close()
             else:
-                # Generic scrape for unknown URLs
-                result = await _generic_scrape(page, url)
+                await browser.close()
 
-            # Validate and attach warnings
-            warnings = validate_result(result)
-            result.warnings.extend(warnings)
 
-        finally:
-            await browser.close()
+def _failed_result(url: str, error: Exception) -> ScrapeResult:
+    """Error result for a URL whose scrape raised."""
+    result = ScrapeResult(
+        source_id=detect_ota(url) or "generic",
+        url=url,
+        scraped_at=now_iso(),
+    )
+    result.success = False
+    result.errors.append(f"Scrape failed: {type(error).__name__}: {error}")
+    return result
 
-    # Return legacy dict format for backward compatibility
-    return result.to_legacy_dict()
+
+async def _scrape_on_page(page, url: str, use_cache: bool) -> ScrapeResult:
+    """Scrape one URL on an already-open page."""
+    source_id = detect_ota(url)
+
+    if source_id:
+        # Use the dedicated parser
+        parser = get_parser(source_id)
+        result = await parser.scrape(page, url, use_cache=use_cache)
+    else:
+        # Generic scrape for unknown URLs
+        result = await _generic_scrape(page, url)
+
+    # Validate and attach warnings
+    warnings = validate_result(result)
+    result.warnings.extend(warnings)
+
+    return result
 
 
 async def _generic_scrape(page, url: str) -> ScrapeResult:
@@ -90,76 +211,109 @@ async def _generic_scrape(page, url: str) -> ScrapeResult:
     result = ScrapeResult(
         source_id="generic",
         url=url,
-        scraped_at=datetime.now().isoformat(),
+        scraped_at=now_iso(),
     )
 
-    success = await navigate_with_retry(page, url)
+    success = await navigate_with_retry(
+        page, url, timeout=30000, ready_selector=CONTENT_READY_SELECTOR
+    )
     if not success:
         result.success = False
         result.errors.append(f"Failed to navigate to {url}")
         return result
 
-    await page.wait_for_timeout(3000)
     await scroll_page(page)
 
-    try:
-        result.title = await page.title()
-    except Exception:
-        pass
-
-    result.raw_text = await safe_extract_text(page)
-    result.extracted_elements = await extract_generic_elements(page)
+    result.title, result.raw_text, result.extracted_elements = (
+        await extract_page_snapshot(page)
+    )
     result.package_links = await extract_package_links(page, url)
 
     return result
 
 
-def save_result(result: dict, output_path: str):
-    """Save the scraped result to a JSON file."""
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(result, f, ensure_ascii=False, indent=2)
+def save_result(result: dict | list[dict], output_path: str):
+    """Save the scraped result (or a list of results) to a JSON file."""
+    if orjson is not None:
+        # C serializer; writes UTF-8 without escaping, like ensure_ascii=False
+        with open(output_path, "wb") as f:
+            f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
     print(f"Saved to: {output_path}")
 
 
 async def main():
     quiet = "--quiet" in sys.argv
     refresh = "--refresh" in sys.argv
+    reparse = "--reparse" in sys.argv
+    shared_browser = "--shared-browser" in sys.argv
+    if "--stop-browser" in sys.argv:
+        print("Stopped shared browser" if stop_shared_browser() else "No shared browser running")
+        return
     save_json = "--json" in sys.argv
     no_db = "--no-db" in sys.argv
-    argv = [a for a in sys.argv[1:] if a not in ("--quiet", "--refresh", "--json", "--no-db")]
+    argv = [a for a in sys.argv[1:] if a not in ("--quiet", "--refresh", "--reparse", "--shared-browser", "--json", "--no-db")]
+    concurrency = DEFAULT_CONCURRENCY
+    if "--concurrency" in argv:
+        i = argv.index("--concurrency")
+        try:
+            concurrency = max(1, int(argv[i + 1]))
+        except (IndexError, ValueError):
+            sys.exit("--concurrency needs a positive integer")
+        del argv[i:i + 2]
 
     url = argv[0] if len(argv) > 0 else "https://www.besttour.com.tw/itinerary/TYO05MM260211AM"
-    output = argv[1] if len(argv) > 1 else None
+    # Further http(s) arguments are extra URLs; the first other one is the output path
+    extra = argv[1:]
+    urls = [url] + [a for a in extra if a.startswith(("http://", "https://"))]
+    paths = [a for a in extra if not a.startswith(("http://", "https://"))]
+    output = paths[0] if paths else None
 
     if refresh:
         print("🔄 Refresh mode: bypassing cache")
     
-    result = await scrape_package(url, use_cache=not refresh)
-
-    if not quiet:
-        print("\n" + "=" * 60)
-        print(f"Title: {result['title']}")
-        print("=" * 60)
-        print("\nRaw Text (first 2000 chars):")
-        print("-" * 60)
-        print(result["raw_text"][:2000])
-        print("-" * 60)
-
-        if result.get("extracted_elements"):
-            print("\nExtracted Elements:")
-            for name, texts in result["extracted_elements"].items():
-                print(f"\n[{name}]")
-                for t in texts[:3]:
-                    print(f"  - {t[:200]}...")
-
-    # Write to Turso DB (primary storage) unless --no-db
-    if not no_db:
-        import_to_turso(result, url)
-    
-    # Save JSON only if --json flag or explicit output path given
-    if save_json or output:
-        output_path = output or f"scrapes/{result.get('source_id', 'unknown')}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
-        save_result(result, output_path)
+    results = await scrape_packages(
+        urls, use_cache=not refresh, concurrency=concurrency,
+        reparse=reparse, shared_browser=shared_browser,
+    )
+
+    for i, (url, result) in enumerate(zip(urls, results)):
+        if not quiet:
+            print("\n" + "=" * 60)
+            print(f"Title: {result['title']}")
+            print("=" * 60)
+            print("\nRaw Text (first 2000 chars):")
+            print("-" * 60)
+            print(result["raw_text"][:2000])
+            print("-" * 60)
+
+            if result.get("extracted_elements"):
+                print("\nExtracted Elements:")
+                for name, texts in result["extracted_elements"].items():
+                    print(f"\n[{name}]")
+                    for t in texts[:3]:
+                        print(f"  - {t[:200]}...")
+
+        # Write to Turso DB (primary storage) unless --no-db
+        if not no_db:
+            import_to_turso(result, url)
+
+        # Save JSON only if --json flag or explicit output path given;
+        # an explicit path with several URLs gets all of them, below
+        if output and len(urls) > 1:
+            continue
+        if save_json or output:
+            if output:
+                output_path = output
+            else:
+                suffix = f"-{i + 1}" if len(urls) > 1 else ""
+                output_path = f"scrapes/{result.get('source_id', 'unknown')}-{datetime.now().strftime('%Y%m%d-%H%M%S')}{suffix}.json"
+            save_result(result, output_path)
+
+    if output and len(urls) > 1:
+        save_result(results, output)
 
 
 def import_to_turso(result: dict, url: str):
@@ -264,4 +418,4 @@ def import_to_turso(result: dict, url: str):
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run_async(main())
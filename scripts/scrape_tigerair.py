@@ -8,6 +8,8 @@ Thin wrapper around scrapers.parsers.tigerair.
 Usage:
     python scripts/scrape_tigerair.py --origin TPE --dest NRT --date 2026-02-13 --pax 2 -o scrapes/tigerair-tpe-nrt.json
     python scripts/scrape_tigerair.py --origin TPE --dest KIX --date 2026-02-13 --return-date 2026-02-17 --pax 2
+    python scripts/scrape_tigerair.py --batch searches.jsonl   # one JSON object of options per line
+    python scripts/scrape_tigerair.py --dest KIX --date 2026-02-13 --format jsonl   # stream legs as they finish
 
 Requirements:
     pip install playwright
@@ -18,25 +20,178 @@ import argparse
 import asyncio
 import json
 import sys
-from datetime import datetime
+from contextlib import contextmanager
 
 try:
-    from playwright.async_api import async_playwright
+    import orjson
 except ImportError:
-    print("Playwright not installed. Run: pip install playwright && playwright install chromium")
-    sys.exit(1)
+    orjson = None
 
-from scrapers import create_browser
+from scrapers.base import create_persistent_browser, now_iso, save_debug_screenshot
 from scrapers.parsers.tigerair import (
-    fill_search_form, extract_flight_results, parse_tigerair_flights,
+    TIGERAIR_ROUTES, fill_search_form, extract_flight_results, parse_tigerair_flights,
 )
 
 
+_FLIGHT_OPTION_SELECTOR = "[class*='flight-option'], [class*='fare'], [class*='journey']"
+
+
+async def _search_oneway(page, origin: str, dest: str, date: str,
+                         args: argparse.Namespace) -> dict:
+    """Run a one-way search on its own page and extract the results."""
+    await fill_search_form(
+        page,
+        origin=origin,
+        dest=dest,
+        date=date,
+        pax=args.pax,
+        lang=args.lang,
+        debug=args.debug,
+        debug_full=args.debug_full,
+    )
+    return await extract_flight_results(
+        page, debug=args.debug, debug_full=args.debug_full,
+        raw_text_limit=args.raw_text_limit,
+    )
+
+
+async def _roundtrip_inbound(page, args: argparse.Namespace) -> dict | None:
+    """Fallback: roundtrip search, pick the first outbound, read return flights."""
+    await fill_search_form(
+        page,
+        origin=args.origin,
+        dest=args.dest,
+        date=args.date,
+        return_date=args.return_date,
+        pax=args.pax,
+        lang=args.lang,
+        debug=args.debug,
+        debug_full=args.debug_full,
+    )
+    await extract_flight_results(page, debug=args.debug, debug_full=args.debug_full,
+                                 raw_text_limit=0)
+
+    print("\nSelecting outbound to see return flights...")
+    flight_options = await page.query_selector_all(_FLIGHT_OPTION_SELECTOR)
+    if not flight_options:
+        return None
+    outbound_option = flight_options[0]
+    await outbound_option.click()
+    # The outbound options match _FLIGHT_OPTION_SELECTOR too, so waiting for
+    # that selector returns at once. Wait instead for the clicked outbound
+    # card to go away (the return grid replaces it), capped at the 3s the
+    # fixed pause used to take when the page keeps it on screen
+    try:
+        await outbound_option.wait_for_element_state("hidden", timeout=3000)
+    except Exception:
+        pass
+    return await extract_flight_results(
+        page, debug=args.debug, debug_full=args.debug_full,
+        raw_text_limit=args.raw_text_limit,
+    )
+
+
+def _cheapest(flights: list[dict]) -> int | None:
+    """Lowest positive fare in one pass, or None when no flight has one."""
+    return min((f["price"] for f in flights if (f.get("price") or 0) > 0), default=None)
+
+
+def _print_flights(label: str, flights: list[dict]) -> None:
+    print(f"\n{label} flights found: {len(flights)}")
+    for f in flights:
+        price_str = f"TWD {f['price']:,}" if f.get("price") else "?"
+        print(f"  {f.get('flight_number', '?')} "
+              f"{f.get('departure_time', '?')} → {f.get('arrival_time', '?')} "
+              f"  {price_str}")
+
+
+def _import_playwright():
+    # Imported here so --help and argument errors never load Playwright
+    try:
+        from playwright.async_api import async_playwright
+    except ImportError:
+        print("Playwright not installed. Run: pip install playwright && playwright install chromium")
+        sys.exit(1)
+    return async_playwright
+
+
+async def _launch(p, args: argparse.Namespace):
+    # Reused profile keeps Tigerair's cache and cookies warm across runs.
+    # Keep images in --debug so the step screenshots stay readable.
+    return await create_persistent_browser(
+        p, "tigerair",
+        viewport={"width": 1280, "height": 800},
+        block_resources=not args.debug,
+        fresh=args.fresh_profile,
+    )
+
+
 async def scrape_tigerair(args: argparse.Namespace) -> dict:
     """Main scrape function."""
-    result = {
+    # Known-bad routes fail here, before Chromium starts
+    error = _route_error(args)
+    if error:
+        return _unsupported_result(args, error)
+
+    async_playwright = _import_playwright()
+
+    async with async_playwright() as p:
+        context, page = await _launch(p, args)
+        try:
+            return await _scrape_on_context(context, page, args)
+        finally:
+            await context.close()
+
+
+async def scrape_tigerair_batch(queries: list[argparse.Namespace],
+                                concurrency: int = 2) -> list[dict]:
+    """Run several searches in one browser session, `concurrency` at a time."""
+    results: list[dict | None] = [None] * len(queries)
+    runnable = []
+    for i, args in enumerate(queries):
+        error = _route_error(args)
+        if error:
+            results[i] = _unsupported_result(args, error)
+        else:
+            runnable.append(i)
+    if not runnable:
+        return results
+
+    async_playwright = _import_playwright()
+
+    async with async_playwright() as p:
+        context, page = await _launch(p, queries[runnable[0]])
+        await page.close()
+        sem = asyncio.Semaphore(concurrency)
+
+        async def scrape_one(args: argparse.Namespace) -> dict:
+            async with sem:
+                page = await context.new_page()
+                try:
+                    return await _scrape_on_context(context, page, args)
+                finally:
+                    await page.close()
+
+        try:
+            scraped = await asyncio.gather(*(scrape_one(queries[i]) for i in runnable))
+        finally:
+            await context.close()
+
+    for i, result in zip(runnable, scraped):
+        results[i] = result
+    return results
+
+
+async def _scrape_on_context(context, page, args: argparse.Namespace) -> dict:
+    """Search one route on `page`, opening sibling pages on `context` as needed."""
+    with _jsonl_sink(args) as emit:
+        return await _scrape_route(context, page, args, emit)
+
+
+def _new_result(args: argparse.Namespace) -> dict:
+    return {
         "source": "tigerair",
-        "scraped_at": datetime.now().isoformat(),
+        "scraped_at": now_iso(),
         "params": {
             "origin": args.origin,
             "destination": args.dest,
@@ -48,112 +203,278 @@ async def scrape_tigerair(args: argparse.Namespace) -> dict:
         "inbound": {"flights": [], "raw_text": ""},
     }
 
-    async with async_playwright() as p:
-        browser, context, page = await create_browser(
-            p, viewport={"width": 1280, "height": 800}
-        )
 
-        try:
-            # Fill form and search
-            await fill_search_form(
-                page,
-                origin=args.origin,
-                dest=args.dest,
-                date=args.date,
-                return_date=args.return_date,
-                pax=args.pax,
-                lang=args.lang,
-                debug=args.debug,
-            )
-
-            # Wait and extract outbound results
-            outbound = await extract_flight_results(page, debug=args.debug)
-            result["outbound"]["flights"] = outbound["flights"]
-            result["outbound"]["raw_text"] = outbound["raw_text"][:5000]
-
-            print(f"\nOutbound flights found: {len(outbound['flights'])}")
-            for f in outbound["flights"]:
-                price_str = f"TWD {f['price']:,}" if f.get("price") else "?"
-                print(f"  {f.get('flight_number', '?')} "
-                      f"{f.get('departure_time', '?')} → {f.get('arrival_time', '?')} "
-                      f"  {price_str}")
-
-            # If roundtrip, select cheapest outbound and get return flights
-            if args.return_date and outbound["flights"]:
-                print("\nSelecting outbound to see return flights...")
-                flight_options = await page.query_selector_all(
-                    "[class*='flight-option'], [class*='fare'], [class*='journey']"
-                )
-                if flight_options:
-                    try:
-                        await flight_options[0].click()
-                        await page.wait_for_timeout(3000)
-
-                        inbound = await extract_flight_results(page, debug=args.debug)
-                        result["inbound"]["flights"] = inbound["flights"]
-                        result["inbound"]["raw_text"] = inbound["raw_text"][:5000]
-
-                        print(f"\nReturn flights found: {len(inbound['flights'])}")
-                        for f in inbound["flights"]:
-                            price_str = f"TWD {f['price']:,}" if f.get("price") else "?"
-                            print(f"  {f.get('flight_number', '?')} "
-                                  f"{f.get('departure_time', '?')} → {f.get('arrival_time', '?')} "
-                                  f"  {price_str}")
-                    except Exception as e:
-                        print(f"  Could not get return flights: {e}")
-
-        except Exception as e:
-            result["error"] = str(e)
-            print(f"\nError during scrape: {e}")
-            if args.debug:
-                await page.screenshot(path="/tmp/tigerair-error.png")
-
-        finally:
-            await browser.close()
-
-    # Summary
+def _summarize(result: dict) -> dict:
     out_count = len(result["outbound"]["flights"])
     in_count = len(result["inbound"]["flights"])
-    cheapest_out = min((f["price"] for f in result["outbound"]["flights"] if f.get("price")), default=None)
-    cheapest_in = min((f["price"] for f in result["inbound"]["flights"] if f.get("price")), default=None)
+    cheapest_out = _cheapest(result["outbound"]["flights"])
+    cheapest_in = _cheapest(result["inbound"]["flights"])
 
     result["summary"] = {
         "outbound_options": out_count,
         "inbound_options": in_count,
         "cheapest_outbound": cheapest_out,
         "cheapest_inbound": cheapest_in,
-        "cheapest_roundtrip": (cheapest_out or 0) + (cheapest_in or 0) if cheapest_out and cheapest_in else None,
+        "cheapest_roundtrip": (
+            cheapest_out + cheapest_in
+            if cheapest_out is not None and cheapest_in is not None else None
+        ),
     }
+    return result
+
+
+def _route_error(args: argparse.Namespace) -> str | None:
+    """
+    Why Tigerair can't fly this route per TIGERAIR_ROUTES, or None.
+
+    Only routes touching an airport listed as a TIGERAIR_ROUTES origin can be
+    judged; anything else (and --any-route) is allowed through.
+    """
+    if args.any_route:
+        return None
+    origin, dest = args.origin.upper(), args.dest.upper()
+    for hub, other in ((origin, dest), (dest, origin)):
+        known = TIGERAIR_ROUTES.get(hub)
+        if known is not None and other not in known:
+            return (f"Route {origin}→{dest} is not a known Tigerair route "
+                    f"(from {hub}: {', '.join(known)}); pass --any-route to try anyway")
+    return None
+
+
+def _unsupported_result(args: argparse.Namespace, error: str) -> dict:
+    print(f"Skipping {args.origin} → {args.dest}: {error}")
+    result = _new_result(args)
+    result["error"] = "unsupported_route"
+    result["message"] = error
+    return _summarize(result)
+
+
+async def _scrape_route(context, page, args: argparse.Namespace, emit) -> dict:
+    result = _new_result(args)
+    emit({"record": "search", "source": result["source"],
+          "scraped_at": result["scraped_at"], "params": result["params"]})
+
+    inbound_page = None
+    try:
+        inbound = None
+        if args.return_date:
+            # Both legs are independent one-way searches; run them side by side
+            inbound_page = await context.new_page()
+            outbound, inbound = await asyncio.gather(
+                _search_oneway(page, args.origin, args.dest, args.date, args),
+                _search_oneway(inbound_page, args.dest, args.origin, args.return_date, args),
+                return_exceptions=True,
+            )
+            if isinstance(outbound, Exception):
+                raise outbound
+            if isinstance(inbound, Exception):
+                print(f"  One-way return search failed: {inbound}")
+                inbound = None
+        else:
+            outbound = await _search_oneway(page, args.origin, args.dest, args.date, args)
+
+        result["outbound"]["flights"] = outbound["flights"]
+        result["outbound"]["raw_text"] = outbound["raw_text"][:args.raw_text_limit]
+        emit({"record": "leg", "leg": "outbound", **result["outbound"]})
+        _print_flights("Outbound", outbound["flights"])
+
+        # Fall back to the roundtrip click-through when the one-way return is empty
+        if args.return_date and not (inbound and inbound["flights"]) and outbound["flights"]:
+            try:
+                inbound = await _roundtrip_inbound(page, args)
+            except Exception as e:
+                print(f"  Could not get return flights: {e}")
+
+        if inbound:
+            result["inbound"]["flights"] = inbound["flights"]
+            result["inbound"]["raw_text"] = inbound["raw_text"][:args.raw_text_limit]
+            emit({"record": "leg", "leg": "inbound", **result["inbound"]})
+            _print_flights("Return", inbound["flights"])
+
+    except Exception as e:
+        result["error"] = str(e)
+        print(f"\nError during scrape: {e}")
+        if args.debug:
+            await save_debug_screenshot(page, "tigerair-error", full_page=args.debug_full)
+
+    finally:
+        if inbound_page is not None:
+            await inbound_page.close()
+
+    _summarize(result)
+    emit({"record": "summary", "summary": result["summary"], "error": result.get("error")})
 
     return result
 
 
-def parse_args() -> argparse.Namespace:
+def _non_negative_int(value: str) -> int:
+    try:
+        n = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a whole number, got {value!r}")
+    if n < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or more, got {n}")
+    return n
+
+
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Scrape Tigerair Taiwan flights")
     parser.add_argument("--origin", default="TPE", help="Departure airport (default: TPE)")
-    parser.add_argument("--dest", required=True, help="Destination airport (e.g., NRT, KIX)")
-    parser.add_argument("--date", required=True, help="Departure date (YYYY-MM-DD)")
+    parser.add_argument("--dest", help="Destination airport (e.g., NRT, KIX)")
+    parser.add_argument("--date", help="Departure date (YYYY-MM-DD)")
     parser.add_argument("--return-date", default=None, help="Return date (YYYY-MM-DD, omit for one-way)")
+    parser.add_argument("--any-route", action="store_true",
+                        help="Search even if the route is not in the known Tigerair route map")
     parser.add_argument("--pax", type=int, default=2, help="Number of adult passengers (default: 2)")
     parser.add_argument("--lang", default="zh-TW", help="Language: en-US or zh-TW (default: zh-TW)")
     parser.add_argument("-o", "--output", default=None, help="Output JSON file")
-    parser.add_argument("--debug", action="store_true", help="Save screenshots at each step")
-    return parser.parse_args()
+    parser.add_argument("--format", choices=("json", "jsonl"), default="json",
+                        help="json: one document at the end (default); jsonl: stream "
+                             "search/leg/summary records as each is scraped")
+    parser.add_argument("--raw-text-limit", type=_non_negative_int, default=5000,
+                        help="Page text chars kept per leg in the output (default: 5000, 0 = none)")
+    parser.add_argument("--debug", action="store_true", help="Save JPEG screenshots at each step")
+    parser.add_argument("--debug-full", action="store_true",
+                        help="Like --debug, with full-page screenshots")
+    parser.add_argument("--fresh-profile", action="store_true",
+                        help="Discard the saved browser profile (cache/cookies) before scraping")
+    parser.add_argument("--batch", default=None,
+                        help="JSONL file of searches run in one browser session; each line "
+                             "overrides options by name (give each its own \"output\" "
+                             "rather than -o), e.g. "
+                             '{"dest": "KIX", "date": "2026-02-13", "return_date": "2026-02-17"}')
+    parser.add_argument("--concurrency", type=int, default=2,
+                        help="Searches run at once in --batch mode (default: 2; "
+                             "roundtrips use two pages each)")
+    return parser
 
 
-async def main():
-    args = parse_args()
+def parse_args() -> argparse.Namespace:
+    parser = _build_parser()
+    args = parser.parse_args()
+    args.debug = args.debug or args.debug_full
+    if args.batch and args.output:
+        parser.error('-o/--output can\'t be shared by --batch searches; '
+                     'give a line its own "output" key instead')
+    if not args.batch and not (args.dest and args.date):
+        parser.error("--dest and --date are required (or use --batch)")
+    return args
 
-    print(f"Tigerair Scraper: {args.origin} → {args.dest}")
-    print(f"Date: {args.date}" + (f" → {args.return_date}" if args.return_date else " (one-way)"))
-    print(f"Pax: {args.pax}")
-    print()
 
-    result = await scrape_tigerair(args)
+# Options that belong to the whole batch session, not to one search
+_SESSION_OPTIONS = {"batch", "concurrency", "fresh_profile"}
+
 
-    output_path = args.output or f"scrapes/tigerair-{args.origin.lower()}-{args.dest.lower()}-{args.date}.json"
-    with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(result, f, ensure_ascii=False, indent=2)
+def _coerce_option(action: argparse.Action, value):
+    """
+    Convert one batch-line value the way argparse would convert it on the
+    command line. Raises ValueError (or ArgumentTypeError) when it doesn't fit.
+    """
+    if action.nargs == 0:  # store_true flags
+        if not isinstance(value, bool):
+            raise ValueError("expected true or false")
+        return value
+    if value is None:
+        if action.default is not None:
+            raise ValueError("may not be null")
+        return None
+    if isinstance(value, (bool, dict, list)) or (action.type is None and not isinstance(value, str)):
+        raise ValueError(f"unexpected value {value!r}")
+    if action.type is not None:
+        value = action.type(str(value))
+    if action.choices is not None and value not in action.choices:
+        raise ValueError(f"must be one of {', '.join(map(str, action.choices))}")
+    return value
+
+
+def _load_batch(args: argparse.Namespace) -> list[argparse.Namespace]:
+    """One Namespace per non-empty JSONL line, CLI options as defaults."""
+    actions = {
+        a.dest: a for a in _build_parser()._actions
+        if a.dest not in _SESSION_OPTIONS and a.dest != "help"
+    }
+    queries = []
+    paths: dict[str, int] = {}
+    with open(args.batch, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            where = f"{args.batch}:{line_no}"
+            try:
+                overrides = json.loads(line)
+            except ValueError as e:
+                sys.exit(f"{where}: invalid JSON: {e}")
+            if not isinstance(overrides, dict):
+                sys.exit(f"{where}: expected a JSON object of options")
+            overrides = {k.replace("-", "_"): v for k, v in overrides.items()}
+            unknown = sorted(set(overrides) - set(actions))
+            if unknown:
+                sys.exit(f"{where}: unknown option(s): {', '.join(unknown)}")
+            for key, value in overrides.items():
+                try:
+                    overrides[key] = _coerce_option(actions[key], value)
+                except (ValueError, TypeError, argparse.ArgumentTypeError) as e:
+                    sys.exit(f"{where}: invalid {key}: {e}")
+            query = argparse.Namespace(**{**vars(args), **overrides})
+            query.debug = query.debug or query.debug_full
+            if not (query.dest and query.date):
+                sys.exit(f"{where}: dest and date are required")
+            path = _output_path(query)
+            if path in paths:
+                sys.exit(f"{where}: writes to {path}, same as line {paths[path]}; "
+                         f'give one of them its own "output"')
+            paths[path] = line_no
+            queries.append(query)
+    return queries
+
+
+def _output_path(args: argparse.Namespace) -> str:
+    if args.output:
+        return args.output
+    # Every search field goes into the name so distinct searches never collide
+    parts = ["tigerair", args.origin.lower(), args.dest.lower(), args.date]
+    if args.return_date:
+        parts.append(args.return_date)
+    parts.append(f"{args.pax}pax")
+    if args.lang != "zh-TW":
+        parts.append(args.lang.lower())
+    if args.any_route:
+        parts.append("any")
+    return f"scrapes/{'-'.join(parts)}.{args.format}"
+
+
+@contextmanager
+def _jsonl_sink(args: argparse.Namespace):
+    """
+    Yield an emit(record) callable for one search.
+
+    With --format jsonl each record is written and flushed as soon as it is
+    known (search params, then each leg, then the summary), so a crash keeps
+    the legs already scraped. Otherwise emit does nothing.
+    """
+    if args.format != "jsonl":
+        yield lambda record: None
+        return
+    with open(_output_path(args), "wb") as f:
+        def emit(record: dict) -> None:
+            if orjson is not None:
+                f.write(orjson.dumps(record) + b"\n")
+            else:
+                f.write(json.dumps(record, ensure_ascii=False).encode() + b"\n")
+            f.flush()
+        yield emit
+
+
+def _save(result: dict, args: argparse.Namespace) -> None:
+    output_path = _output_path(args)
+    if args.format == "jsonl":
+        pass  # Already streamed by _jsonl_sink
+    elif orjson is not None:
+        with open(output_path, "wb") as f:
+            f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2))
+    else:
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
 
     print(f"\nSaved to: {output_path}")
 
@@ -166,5 +487,29 @@ async def main():
         print(f"Cheapest total:    TWD {s['cheapest_roundtrip']:,}/person")
 
 
+async def main():
+    args = parse_args()
+
+    if args.batch:
+        queries = _load_batch(args)
+        if not queries:
+            print(f"No searches in {args.batch}")
+            return
+        print(f"Tigerair Scraper: {len(queries)} searches from {args.batch}")
+        print()
+        results = await scrape_tigerair_batch(queries, max(1, args.concurrency))
+        for query, result in zip(queries, results):
+            _save(result, query)
+        return
+
+    print(f"Tigerair Scraper: {args.origin} → {args.dest}")
+    print(f"Date: {args.date}" + (f" → {args.return_date}" if args.return_date else " (one-way)"))
+    print(f"Pax: {args.pax}")
+    print()
+
+    result = await scrape_tigerair(args)
+    _save(result, args)
+
+
 if __name__ == "__main__":
     asyncio.run(main())
@@ -10,12 +10,23 @@ Verifies:
 
 Usage:
     python scripts/scraper_doctor.py
+    python scripts/scraper_doctor.py --shared-browser
+    python scripts/scraper_doctor.py --static
     npm run scraper:doctor
+
+Options:
+    --shared-browser  Run checks in the long-lived headless Chromium shared with
+                      scrape_package.py (started on first use, left running);
+                      stop it with: python scripts/scrape_package.py --stop-browser
+    --static          Try a plain HTTP fetch first (needs httpx + selectolax);
+                      pages whose static HTML already matches are reported as
+                      "reachable" without the browser scrape being verified
 """
 
 import asyncio
 import json
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
 
@@ -26,6 +37,15 @@ try:
 except ImportError:
     PLAYWRIGHT_INSTALLED = False
 
+from scrapers.base import block_heavy_resources, connect_shared_browser
+
+# Optional static-HTML fast path (pip install httpx selectolax)
+try:
+    import httpx
+    from selectolax.parser import HTMLParser
+except ImportError:
+    httpx = None
+
 # Test URLs for each OTA (known-good pages)
 TEST_URLS = {
     "besttour": {
@@ -51,6 +71,9 @@ TEST_URLS = {
     },
 }
 
+# OTA pages checked at once (one pooled context each)
+MAX_CONCURRENT_CHECKS = 4
+
 
 def print_status(name: str, status: str, message: str = ""):
     """Print formatted status line."""
@@ -59,6 +82,7 @@ def print_status(name: str, status: str, message: str = ""):
         "warn": "⚠️",
         "fail": "❌",
         "skip": "⏭️",
+        "reachable": "🌐",
         "info": "ℹ️",
     }
     icon = icons.get(status, "•")
@@ -66,8 +90,53 @@ def print_status(name: str, status: str, message: str = ""):
     print(f"  {icon} {name}{msg}")
 
 
-async def check_ota(source_id: str, config: dict, browser) -> dict:
-    """Test a single OTA scraper."""
+async def check_ota_http(source_id: str, config: dict, client) -> dict | None:
+    """
+    Check an OTA with a plain GET when its listing is server-rendered.
+
+    Returns a result only when the static HTML already has enough matches;
+    None means the page needs a browser (JS rendering, blocking, errors).
+    The status is "reachable", not "ok": the browser scrape path is not run.
+    """
+    start_time = time.perf_counter()
+    try:
+        response = await client.get(config["url"])
+    except Exception:
+        return None
+    if response.status_code >= 400:
+        return None
+
+    try:
+        found = len(HTMLParser(response.text).css(config["expected_selector"]))
+    except Exception:
+        # e.g. Playwright-only selectors selectolax can't parse; let the browser decide
+        return None
+    if found < max(config["min_results"], 1):
+        return None
+
+    response_time = (time.perf_counter() - start_time) * 1000
+    return {
+        "source_id": source_id,
+        "status": "reachable",
+        "message": f"{found} elements found (static HTML)",
+        "elements_found": found,
+        "response_time_ms": int(response_time),
+    }
+
+
+async def new_check_context(browser):
+    """Create a browser context with the doctor's viewport and user agent."""
+    context = await browser.new_context(
+        viewport={"width": 1280, "height": 720},
+        user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+    )
+    # Checks only count selector matches; skip images, fonts and trackers
+    await block_heavy_resources(context)
+    return context
+
+
+async def check_ota(source_id: str, config: dict, context_pool: asyncio.Queue) -> dict:
+    """Test a single OTA scraper on a context borrowed from `context_pool`."""
     result = {
         "source_id": source_id,
         "status": "unknown",
@@ -76,14 +145,12 @@ async def check_ota(source_id: str, config: dict, browser) -> dict:
         "response_time_ms": 0,
     }
 
+    context = await context_pool.get()
+    page = None
     try:
-        context = await browser.new_context(
-            viewport={"width": 1280, "height": 720},
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-        )
         page = await context.new_page()
 
-        start_time = datetime.now()
+        start_time = time.perf_counter()
 
         # Navigate to test URL
         response = await page.goto(config["url"], timeout=30000, wait_until="domcontentloaded")
@@ -91,14 +158,13 @@ async def check_ota(source_id: str, config: dict, browser) -> dict:
         # Wait for content to load
         await page.wait_for_timeout(3000)
 
-        response_time = (datetime.now() - start_time).total_seconds() * 1000
+        response_time = (time.perf_counter() - start_time) * 1000
         result["response_time_ms"] = int(response_time)
 
         # Check response status
         if response and response.status >= 400:
             result["status"] = "fail"
             result["message"] = f"HTTP {response.status}"
-            await context.close()
             return result
 
         # Check for expected elements
@@ -121,17 +187,27 @@ async def check_ota(source_id: str, config: dict, browser) -> dict:
                 result["status"] = "fail"
                 result["message"] = "Page appears empty or blocked"
 
-        await context.close()
-
     except Exception as e:
         result["status"] = "fail"
         result["message"] = str(e)[:100]
 
+    finally:
+        if page is not None:
+            try:
+                await page.close()
+            except Exception:
+                pass
+        context_pool.put_nowait(context)
+
     return result
 
 
-async def run_doctor():
-    """Run all health checks."""
+async def run_doctor(shared_browser: bool = False, static: bool = False):
+    """
+    Run all health checks (in the shared CDP Chromium with `shared_browser`).
+
+    With `static`, pages confirmed by a plain HTTP fetch skip the browser check.
+    """
     print("\n" + "=" * 60)
     print("🩺 Scraper Doctor - Health Check")
     print("=" * 60 + "\n")
@@ -148,9 +224,15 @@ async def run_doctor():
         print_status("playwright", "ok", "Installed")
         try:
             async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                await browser.close()
-            print_status("chromium", "ok", "Browser launches successfully")
+                if shared_browser:
+                    await connect_shared_browser(p)
+                else:
+                    browser = await p.chromium.launch(headless=True)
+                    await browser.close()
+            print_status(
+                "chromium", "ok",
+                "Shared browser reachable" if shared_browser else "Browser launches successfully",
+            )
         except Exception as e:
             print_status("chromium", "fail", f"Browser launch failed: {e}")
             print("\n  Run: playwright install chromium")
@@ -178,34 +260,76 @@ async def run_doctor():
     # 3. Test each OTA
     print("\n3. OTA Connectivity & Scraping")
 
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
-
-        for source_id, config in TEST_URLS.items():
-            result = await check_ota(source_id, config, browser)
-            results["ota_checks"][source_id] = result
-
-            if result["status"] == "ok":
-                print_status(
-                    source_id,
-                    "ok",
-                    f"{result['elements_found']} items, {result['response_time_ms']}ms"
-                )
-            elif result["status"] == "warn":
-                print_status(source_id, "warn", result["message"])
+    checks: dict[str, dict] = {}
+    if static and httpx is None:
+        print_status("static", "warn", "httpx/selectolax not installed; using the browser")
+    if static and httpx is not None:
+        async with httpx.AsyncClient(
+            follow_redirects=True,
+            timeout=15,
+            headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"},
+        ) as client:
+            http_checks = await asyncio.gather(
+                *(check_ota_http(source_id, config, client) for source_id, config in TEST_URLS.items())
+            )
+        checks = {r["source_id"]: r for r in http_checks if r}
+
+    # Only pages the static fetch could not confirm need Chromium
+    pending = {source_id: config for source_id, config in TEST_URLS.items() if source_id not in checks}
+    if pending:
+        async with async_playwright() as p:
+            if shared_browser:
+                browser = await connect_shared_browser(p)
             else:
-                print_status(source_id, "fail", result["message"])
+                browser = await p.chromium.launch(headless=True)
+
+            # A few warm contexts are shared by all checks; only pages are opened
+            # per check, and the pool size caps how many run at once
+            context_pool: asyncio.Queue = asyncio.Queue()
+            for _ in range(min(MAX_CONCURRENT_CHECKS, len(pending))):
+                context_pool.put_nowait(await new_check_context(browser))
+
+            # Checks are network-bound and independent; run them side by side
+            browser_checks = await asyncio.gather(
+                *(check_ota(source_id, config, context_pool) for source_id, config in pending.items())
+            )
+            checks.update(zip(pending, browser_checks))
+
+            while not context_pool.empty():
+                await context_pool.get_nowait().close()
+            if not shared_browser:
+                # The shared Chromium stays up for the next run
+                await browser.close()
 
-        await browser.close()
+    for source_id in TEST_URLS:
+        result = checks[source_id]
+        results["ota_checks"][source_id] = result
+
+        if result["status"] == "ok":
+            print_status(
+                source_id,
+                "ok",
+                f"{result['elements_found']} items, {result['response_time_ms']}ms"
+            )
+        elif result["status"] == "reachable":
+            print_status(source_id, "reachable", result["message"])
+        elif result["status"] == "warn":
+            print_status(source_id, "warn", result["message"])
+        else:
+            print_status(source_id, "fail", result["message"])
 
     # 4. Summary
     print("\n" + "=" * 60)
     ok_count = sum(1 for r in results["ota_checks"].values() if r["status"] == "ok")
+    reachable_count = sum(1 for r in results["ota_checks"].values() if r["status"] == "reachable")
     warn_count = sum(1 for r in results["ota_checks"].values() if r["status"] == "warn")
     fail_count = sum(1 for r in results["ota_checks"].values() if r["status"] == "fail")
 
     total = len(results["ota_checks"])
-    print(f"Summary: {ok_count}/{total} OK, {warn_count} warnings, {fail_count} failures")
+    summary = f"Summary: {ok_count}/{total} OK, {warn_count} warnings, {fail_count} failures"
+    if reachable_count:
+        summary += f", {reachable_count} reachable (static only, scrape not verified)"
+    print(summary)
 
     if fail_count > 0:
         print("\n⚠️  Some scrapers are not working. Check the errors above.")
@@ -213,10 +337,16 @@ async def run_doctor():
     elif warn_count > 0:
         print("\n⚠️  Some scrapers have warnings. They may still work.")
         sys.exit(0)
+    elif reachable_count > 0:
+        print("\nℹ️  Static-only checks passed; run without --static to verify scraping.")
+        sys.exit(0)
     else:
         print("\n✅ All scrapers are healthy!")
         sys.exit(0)
 
 
 if __name__ == "__main__":
-    asyncio.run(run_doctor())
+    asyncio.run(run_doctor(
+        shared_browser="--shared-browser" in sys.argv,
+        static="--static" in sys.argv,
+    ))
@@ -8,15 +8,33 @@ from __future__ import annotations
 
 import asyncio
 import json
+import os
 import re
+import shutil
+import signal
+import subprocess
+import tempfile
+import time
+import urllib.request
 from abc import ABC, abstractmethod
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional
 from urllib.parse import urljoin
 
 from .schema import ScrapeResult
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 # ---------------------------------------------------------------------------
 # OTA Config Loader
@@ -25,6 +43,14 @@ from .schema import ScrapeResult
 _ota_config_cache: dict | None = None
 
 
+def _read_json(path: Path):
+    """Parse a UTF-8 JSON file, with orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
 def load_ota_config() -> dict:
     """Load OTA configuration from ota-sources.json."""
     global _ota_config_cache
@@ -33,13 +59,13 @@ def load_ota_config() -> dict:
 
     config_path = Path(__file__).parent.parent.parent / "data" / "ota-sources.json"
     if config_path.exists():
-        with open(config_path, encoding="utf-8") as f:
-            _ota_config_cache = json.load(f).get("sources", {})
+        _ota_config_cache = _read_json(config_path).get("sources", {})
     else:
         _ota_config_cache = {}
     return _ota_config_cache
 
 
+@lru_cache(maxsize=16)
 def get_listing_selectors(source_id: str) -> dict | None:
     """Get listing selectors for an OTA from config."""
     config = load_ota_config()
@@ -69,16 +95,26 @@ BAGGAGE_PATTERNS = {
 }
 
 
+_BAGGAGE_INCLUDED = [re.compile(p, re.IGNORECASE) for p in BAGGAGE_PATTERNS["included"]]
+# One scan per category. The included alternation only gates the ordered
+# per-pattern pass, since list order (not text position) picks the kg value.
+_BAGGAGE_INCLUDED_ANY = re.compile(
+    "|".join(f"(?:{p})" for p in BAGGAGE_PATTERNS["included"]), re.IGNORECASE
+)
+_BAGGAGE_NOT_INCLUDED_RE = re.compile(
+    "|".join(f"(?:{p})" for p in BAGGAGE_PATTERNS["not_included"]), re.IGNORECASE
+)
+
+
 def extract_baggage_info(raw_text: str) -> dict:
     """Extract baggage info from raw text. Returns {"included": bool|None, "kg": int|None}."""
-    text = raw_text.lower() if raw_text else ""
-    for pattern in BAGGAGE_PATTERNS["included"]:
-        m = re.search(pattern, raw_text, re.IGNORECASE)
-        if m:
-            return {"included": True, "kg": int(m.group(1))}
-    for pattern in BAGGAGE_PATTERNS["not_included"]:
-        if re.search(pattern, raw_text, re.IGNORECASE):
-            return {"included": False, "kg": None}
+    if _BAGGAGE_INCLUDED_ANY.search(raw_text):
+        for pattern in _BAGGAGE_INCLUDED:
+            m = pattern.search(raw_text)
+            if m:
+                return {"included": True, "kg": int(m.group(1))}
+    if _BAGGAGE_NOT_INCLUDED_RE.search(raw_text):
+        return {"included": False, "kg": None}
     return {"included": None, "kg": None}
 
 
@@ -95,13 +131,13 @@ def _load_hotel_areas() -> dict:
         return _hotel_areas_cache
     path = Path(__file__).parent.parent.parent / "data" / "hotel-areas.json"
     if path.exists():
-        with open(path, encoding="utf-8") as f:
-            _hotel_areas_cache = json.load(f)
+        _hotel_areas_cache = _read_json(path)
     else:
         _hotel_areas_cache = {}
     return _hotel_areas_cache
 
 
+@lru_cache(maxsize=4096)
 def detect_hotel_area(hotel_name: str, region: str) -> str:
     """Detect hotel area type from name. Returns 'central', 'airport', 'suburb', etc."""
     areas = _load_hotel_areas().get(region, {})
@@ -112,6 +148,7 @@ def detect_hotel_area(hotel_name: str, region: str) -> str:
     return "unknown"
 
 
+@lru_cache(maxsize=256)
 def _infer_region(url: str) -> str:
     """Best-effort region inference from URL keywords."""
     u = url.lower()
@@ -121,75 +158,461 @@ def _infer_region(url: str) -> str:
     return ""
 
 
+# ---------------------------------------------------------------------------
+# Text helpers
+# ---------------------------------------------------------------------------
+
+def compile_spaced_keywords(*keywords: str) -> re.Pattern:
+    """
+    Compile keywords into one alternation that tolerates spaces between characters.
+
+    Searching raw text with it finds the same keywords as searching
+    raw_text.replace(" ", ""), without building the copy. Alternatives are tried
+    in the given order; use match_keyword() to normalize a hit.
+    """
+    return re.compile("|".join(" *".join(map(re.escape, kw)) for kw in keywords))
+
+
+def match_keyword(m: re.Match) -> str:
+    """Return the keyword a compile_spaced_keywords() match stands for."""
+    return m.group().replace(" ", "")
+
+
+def now_iso() -> str:
+    """Current local time as ISO-8601 to the second, for scraped_at fields."""
+    return datetime.now().isoformat(timespec="seconds")
+
+
 # ---------------------------------------------------------------------------
 # Browser helpers
 # ---------------------------------------------------------------------------
 
-async def create_browser(playwright, headless: bool = True, viewport: dict | None = None):
-    """Create a browser + context with standard settings."""
-    browser = await playwright.chromium.launch(headless=headless)
+def run_async(main):
+    """
+    Run a coroutine like asyncio.run, on uvloop when installed (faster CDP
+    message dispatch). Event loop policies are deprecated from Python 3.14,
+    so the loop is chosen here rather than installed globally.
+    """
+    if uvloop is None:
+        return asyncio.run(main)
+    return uvloop.run(main)
+
+
+# Resource types that never feed text extraction. Stylesheets are kept on
+# purpose: innerText depends on CSS visibility.
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+BLOCKED_URL_PARTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "facebook.net",
+    "hotjar.com",
+)
+
+
+async def _route_blocking_handler(route) -> None:
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(
+        part in request.url for part in BLOCKED_URL_PARTS
+    ):
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def block_heavy_resources(context) -> None:
+    """Abort images, fonts, media and tracker requests for a context or page."""
+    await context.route("**/*", _route_blocking_handler)
+
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+
+async def new_scrape_context(
+    browser, viewport: dict | None = None, block_resources: bool = False
+):
+    """Create a context with the standard viewport and user agent."""
     context = await browser.new_context(
         viewport=viewport or {"width": 1920, "height": 1080},
-        user_agent=(
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/120.0.0.0 Safari/537.36"
-        ),
+        user_agent=USER_AGENT,
     )
+    await context.add_init_script(_SNAPSHOT_INIT_JS)
+    if block_resources:
+        await block_heavy_resources(context)
+    return context
+
+
+async def create_browser(
+    playwright,
+    headless: bool = True,
+    viewport: dict | None = None,
+    block_resources: bool = False,
+):
+    """
+    Create a browser + context with standard settings.
+
+    With block_resources, the context skips images/fonts/media/trackers,
+    which text-only scrapes never read.
+    """
+    browser = await playwright.chromium.launch(headless=headless)
+    context = await new_scrape_context(browser, viewport, block_resources)
     page = await context.new_page()
     return browser, context, page
 
 
+# Per-script Chromium profiles reused by create_persistent_browser()
+PROFILE_ROOT = Path.home() / ".cache" / "travel-2026"
+
+
+async def create_persistent_browser(
+    playwright,
+    profile: str,
+    headless: bool = True,
+    viewport: dict | None = None,
+    block_resources: bool = False,
+    fresh: bool = False,
+):
+    """
+    Launch Chromium on a persistent profile and return (context, page).
+
+    The profile under PROFILE_ROOT keeps the HTTP cache, cookies and storage
+    between runs, so repeat visits skip static downloads and bot checks.
+    fresh=True wipes it first. Close the context (not a browser) when done.
+
+    Chromium locks a profile to one process; when another run holds it, this
+    run falls back to a throwaway profile (removed when the context closes)
+    rather than failing, so parallel runs keep working, just without the
+    warm cache.
+    """
+    user_data_dir = PROFILE_ROOT / profile
+    if fresh:
+        shutil.rmtree(user_data_dir, ignore_errors=True)
+    user_data_dir.mkdir(parents=True, exist_ok=True)
+
+    options = {
+        "headless": headless,
+        "viewport": viewport or {"width": 1920, "height": 1080},
+        "user_agent": USER_AGENT,
+    }
+    try:
+        context = await playwright.chromium.launch_persistent_context(
+            str(user_data_dir), **options
+        )
+    except Exception:
+        if not os.path.lexists(user_data_dir / "SingletonLock"):
+            raise
+        print(f"  Profile {profile} is in use by another run; using a temporary profile")
+        temp_dir = tempfile.mkdtemp(prefix=f"{profile}-", dir=PROFILE_ROOT)
+        context = await playwright.chromium.launch_persistent_context(temp_dir, **options)
+        context.on("close", lambda _: shutil.rmtree(temp_dir, ignore_errors=True))
+    if block_resources:
+        await block_heavy_resources(context)
+    page = context.pages[0] if context.pages else await context.new_page()
+    return context, page
+
+
+async def save_debug_screenshot(page, name: str, full_page: bool = False) -> str:
+    """
+    Save a JPEG screenshot as <tmp>/<name>.jpg and return its path.
+
+    Viewport JPEGs encode far faster than full-page PNGs; pass
+    full_page=True only when the whole page is needed.
+    """
+    path = str(Path(tempfile.gettempdir()) / f"{name}.jpg")
+    await page.screenshot(path=path, type="jpeg", quality=60, full_page=full_page)
+    return path
+
+
+# State of the long-lived Chromium used by connect_shared_browser(). It lives
+# under PROFILE_ROOT (private to the user), not the shared temp directory.
+SHARED_BROWSER_DIR = PROFILE_ROOT / "shared-cdp"
+SHARED_BROWSER_PROFILE = SHARED_BROWSER_DIR / "profile"
+SHARED_BROWSER_FILE = SHARED_BROWSER_DIR / "browser.json"
+SHARED_BROWSER_LOCK = SHARED_BROWSER_DIR / "browser.lock"
+# A lock older than this is left over from a run that died while holding it
+_SHARED_LOCK_STALE_SECONDS = 60.0
+
+
+def _read_shared_browser() -> dict | None:
+    try:
+        return json.loads(SHARED_BROWSER_FILE.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_shared_browser(info: dict) -> None:
+    SHARED_BROWSER_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+    fd = os.open(SHARED_BROWSER_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        json.dump(info, f)
+
+
+def _try_shared_lock() -> bool:
+    """Create SHARED_BROWSER_LOCK exclusively. Returns False if another run holds it."""
+    SHARED_BROWSER_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+    try:
+        os.close(os.open(SHARED_BROWSER_LOCK, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600))
+        return True
+    except FileExistsError:
+        pass
+    try:
+        if time.time() - SHARED_BROWSER_LOCK.stat().st_mtime > _SHARED_LOCK_STALE_SECONDS:
+            SHARED_BROWSER_LOCK.unlink(missing_ok=True)
+    except OSError:
+        pass  # Released between our open and stat, retry
+    return False
+
+
+def _is_shared_browser(info: dict) -> bool:
+    """
+    True when the recorded endpoint still answers as the Chromium we launched.
+
+    Probes /json/version over HTTP (no `ps`, so it works on Windows and in
+    minimal containers) and compares the browser's DevTools id, which is
+    unique per launch, so a reused port or a foreign browser never matches.
+    """
+    try:
+        with urllib.request.urlopen(f"{info['endpoint']}/json/version", timeout=2) as resp:
+            version = json.load(resp)
+    except (OSError, ValueError, KeyError):
+        return False
+    ws_url = version.get("webSocketDebuggerUrl", "")
+    return bool(info.get("browser_path")) and ws_url.endswith(info["browser_path"])
+
+
+async def _devtools_endpoint(proc: subprocess.Popen, timeout: float = 10.0) -> tuple[str, str]:
+    """
+    Wait for Chromium to write DevToolsActivePort.
+
+    Returns its HTTP endpoint and the browser's /devtools/browser/<id> path.
+    """
+    port_file = SHARED_BROWSER_PROFILE / "DevToolsActivePort"
+    for _ in range(int(timeout / 0.2)):
+        if proc.poll() is not None:
+            break
+        try:
+            port, _, browser_path = port_file.read_text().partition("\n")
+        except OSError:
+            port, browser_path = "", ""
+        port, browser_path = port.strip(), browser_path.strip()
+        if port.isdigit() and browser_path:
+            return f"http://127.0.0.1:{port}", browser_path
+        await asyncio.sleep(0.2)
+    raise RuntimeError("Shared browser did not report a DevTools port")
+
+
+async def _launch_shared_browser(playwright) -> dict:
+    """Start the shared Chromium and record it. Call with the launch lock held."""
+    SHARED_BROWSER_PROFILE.mkdir(mode=0o700, parents=True, exist_ok=True)
+    (SHARED_BROWSER_PROFILE / "DevToolsActivePort").unlink(missing_ok=True)
+    proc = subprocess.Popen(
+        [
+            playwright.chromium.executable_path,
+            "--headless=new",
+            "--remote-debugging-port=0",
+            f"--user-data-dir={SHARED_BROWSER_PROFILE}",
+            "--no-first-run",
+            "--no-default-browser-check",
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    endpoint, browser_path = await _devtools_endpoint(proc)
+    info = {"endpoint": endpoint, "browser_path": browser_path, "pid": proc.pid}
+    _write_shared_browser(info)
+    return info
+
+
+async def connect_shared_browser(playwright):
+    """
+    Connect over CDP to a long-lived headless Chromium, launching it if needed.
+
+    The Chromium process outlives the calling script, so later runs skip
+    browser startup. Callers should close only the contexts they create;
+    stop the process with stop_shared_browser(). Chromium picks a free
+    DevTools port, and a recorded endpoint is only reused while it still
+    answers with the browser id we recorded, so a foreign browser is never
+    attached to. Launching and recording happen under a lock file, so
+    concurrent first runs share one browser instead of each starting one.
+    """
+    info = _read_shared_browser()
+    if not (info and await asyncio.to_thread(_is_shared_browser, info)):
+        for _ in range(int(_SHARED_LOCK_STALE_SECONDS / 0.2)):
+            if _try_shared_lock():
+                break
+            await asyncio.sleep(0.2)
+        else:
+            raise RuntimeError(f"Timed out waiting for {SHARED_BROWSER_LOCK}")
+        try:
+            # Another run may have launched it while we waited for the lock
+            info = _read_shared_browser()
+            if not (info and await asyncio.to_thread(_is_shared_browser, info)):
+                info = await _launch_shared_browser(playwright)
+        finally:
+            SHARED_BROWSER_LOCK.unlink(missing_ok=True)
+
+    for _ in range(50):
+        try:
+            return await playwright.chromium.connect_over_cdp(info["endpoint"])
+        except Exception:
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Shared browser did not come up on {info['endpoint']}")
+
+
+def stop_shared_browser() -> bool:
+    """Terminate the shared Chromium, if one is recorded. Returns True if stopped."""
+    for _ in range(int(_SHARED_LOCK_STALE_SECONDS / 0.2)):
+        if _try_shared_lock():
+            break
+        time.sleep(0.2)
+    else:
+        return False
+    try:
+        info = _read_shared_browser()
+        SHARED_BROWSER_FILE.unlink(missing_ok=True)
+        # A stale record may name a pid that now belongs to something else;
+        # while our browser still answers with its id, the pid is still ours
+        if not info or not _is_shared_browser(info):
+            return False
+        try:
+            os.kill(info["pid"], signal.SIGTERM)
+        except OSError:
+            return False
+        return True
+    finally:
+        SHARED_BROWSER_LOCK.unlink(missing_ok=True)
+
+
+# Visible main/price content means a package page has rendered enough to read
+CONTENT_READY_SELECTOR = "main, #content, .content, .itinerary, .price, [class*='price']"
+
+
+async def page_loaded_after_timeout(page, error: Exception) -> bool:
+    """
+    True when a goto timed out but the document has already been parsed.
+
+    networkidle often never settles on tracker-heavy pages even though the
+    content is there; navigating again would just repeat the wait.
+    """
+    # Imported here so base.py stays importable without Playwright
+    try:
+        from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+    except ImportError:
+        return False
+    if not isinstance(error, PlaywrightTimeoutError):
+        return False
+    if page.url.startswith(("about:", "chrome-error:")):
+        return False
+    try:
+        return await page.evaluate("() => document.readyState !== 'loading'")
+    except Exception:
+        return False
+
+
 async def navigate_with_retry(
     page,
     url: str,
     max_retries: int = 3,
     backoff_base: float = 2.0,
     timeout: int = 60000,
+    ready_selector: str | None = None,
+    ready_timeout: int = 15000,
 ) -> bool:
     """
     Navigate to a URL with exponential backoff retry.
 
     Tries networkidle first, falls back to domcontentloaded, then retries.
+    A networkidle timeout on an already-parsed document counts as success
+    rather than triggering a second goto.
+    With ready_selector, skips networkidle (trackers and sockets can hold it
+    open): loads to domcontentloaded, then waits up to ready_timeout for the
+    selector to be visible. Missing the selector is not a failure.
     Returns True if navigation succeeded, False if all retries exhausted.
     """
-    strategies = ["networkidle", "domcontentloaded"]
+    strategies = ["domcontentloaded"] if ready_selector else ["networkidle", "domcontentloaded"]
+    error: Exception | None = None
 
     for attempt in range(max_retries):
         for strategy in strategies:
             try:
                 await page.goto(url, wait_until=strategy, timeout=timeout)
-                return True
             except Exception as e:
-                if strategy == "networkidle":
-                    # Expected — try domcontentloaded next
-                    continue
-                elif attempt < max_retries - 1:
-                    wait_time = backoff_base ** (attempt + 1)
-                    print(f"  Retry {attempt + 1}/{max_retries} after {wait_time:.0f}s: {e}")
-                    await asyncio.sleep(wait_time)
-                    break  # Break inner loop, retry outer loop
-                else:
-                    print(f"  All {max_retries} retries failed for {url}: {e}")
-                    return False
-
+                # A networkidle timeout on a parsed document is good enough
+                if strategy == "networkidle" and await page_loaded_after_timeout(page, e):
+                    return True
+                error = e
+                continue
+            if ready_selector:
+                try:
+                    await page.wait_for_selector(
+                        ready_selector, state="visible", timeout=ready_timeout
+                    )
+                except Exception:
+                    pass
+            return True
+
+        # Every strategy failed on this attempt
+        if attempt < max_retries - 1:
+            wait_time = backoff_base ** (attempt + 1)
+            print(f"  Retry {attempt + 1}/{max_retries} after {wait_time:.0f}s: {error}")
+            await asyncio.sleep(wait_time)
+
+    print(f"  All {max_retries} retries failed for {url}: {error}")
     return False
 
 
+# True once document height is unchanged since the previous poll
+_STABLE_HEIGHT_JS = """() => {
+    const h = document.body.scrollHeight;
+    const stable = window.__scrapeLastHeight === h;
+    window.__scrapeLastHeight = h;
+    return stable;
+}"""
+
+# Scroll to y unless it is past the page's current maximum scroll offset
+_SCROLL_STEP_JS = """(y) => {
+    if (y > document.body.scrollHeight - window.innerHeight) return false;
+    window.scrollTo(0, y);
+    return true;
+}"""
+
+
+async def wait_for_stable_height(page, timeout_ms: int, poll_ms: int = 250) -> None:
+    """Wait until lazy-loaded content stops growing the page, capped at timeout_ms."""
+    try:
+        await page.evaluate("() => { window.__scrapeLastHeight = undefined; }")
+        await page.wait_for_function(
+            _STABLE_HEIGHT_JS, polling=min(poll_ms, timeout_ms), timeout=timeout_ms
+        )
+    except Exception:
+        pass
+
+
 async def scroll_page(page, steps: int = 5, step_delay_ms: int = 500, final_delay_ms: int = 2000):
-    """Scroll page in steps to trigger lazy loading."""
+    """
+    Scroll page in steps to trigger lazy loading.
+
+    The delays are upper bounds: each scroll returns as soon as the page
+    height has settled, and the steps stop once they pass the bottom.
+    """
     # Initial scroll to bottom
     await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-    await page.wait_for_timeout(final_delay_ms)
+    await wait_for_stable_height(page, final_delay_ms)
 
     # Scroll in incremental steps
     for i in range(steps):
-        await page.evaluate(f"window.scrollTo(0, {(i + 1) * 1000})")
-        await page.wait_for_timeout(step_delay_ms)
+        if not await page.evaluate(_SCROLL_STEP_JS, (i + 1) * 1000):
+            break
+        await wait_for_stable_height(page, step_delay_ms)
 
     # Final scroll to bottom
     await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-    await page.wait_for_timeout(final_delay_ms)
+    await wait_for_stable_height(page, final_delay_ms)
 
 
 async def safe_extract_text(page) -> str:
@@ -201,38 +624,134 @@ async def safe_extract_text(page) -> str:
         return ""
 
 
+GENERIC_SELECTORS = [
+    (".price", "price_element"),
+    (".itinerary", "itinerary_element"),
+    (".flight-info", "flight_element"),
+    (".hotel-info", "hotel_element"),
+    ("[class*='price']", "price_class"),
+    ("[class*='flight']", "flight_class"),
+    ("[class*='hotel']", "hotel_class"),
+    ("table", "tables"),
+    (".content", "content"),
+    ("main", "main"),
+    ("#content", "content_id"),
+]
+
+# First 5 matches per selector, non-empty trimmed text. One querySelectorAll
+# over the joined list walks the DOM once; matches() assigns each hit to its
+# selectors, and document order is the same as querying them one by one.
+_GENERIC_ELEMENTS_JS = """(selectors) => {
+    const texts = selectors.map(() => []);
+    const counts = selectors.map(() => 0);
+    let open = selectors.length;
+    const joined = selectors.map(([selector]) => selector).join(", ");
+    for (const el of document.querySelectorAll(joined)) {
+        selectors.forEach(([selector], i) => {
+            if (counts[i] >= 5 || !el.matches(selector)) return;
+            if (++counts[i] === 5) open--;
+            const text = (el.innerText || "").trim();
+            if (text) texts[i].push(text);
+        });
+        if (!open) break;
+    }
+    const extracted = {};
+    selectors.forEach(([, name], i) => {
+        if (texts[i].length) extracted[name] = texts[i];
+    });
+    return extracted;
+}"""
+
+
 async def extract_generic_elements(page) -> dict[str, list[str]]:
-    """Extract elements matching common travel-site CSS selectors."""
-    selectors_to_try = [
-        (".price", "price_element"),
-        (".itinerary", "itinerary_element"),
-        (".flight-info", "flight_element"),
-        (".hotel-info", "hotel_element"),
-        ("[class*='price']", "price_class"),
-        ("[class*='flight']", "flight_class"),
-        ("[class*='hotel']", "hotel_class"),
-        ("table", "tables"),
-        (".content", "content"),
-        ("main", "main"),
-        ("#content", "content_id"),
-    ]
-
-    extracted = {}
-    for selector, name in selectors_to_try:
-        try:
-            elements = await page.query_selector_all(selector)
-            if elements:
-                texts = []
-                for el in elements[:5]:
-                    text = await el.inner_text()
-                    if text.strip():
-                        texts.append(text.strip())
-                if texts:
-                    extracted[name] = texts
-        except Exception:
-            pass
+    """Extract elements matching common travel-site CSS selectors (one round-trip)."""
+    try:
+        return await page.evaluate(_GENERIC_ELEMENTS_JS, GENERIC_SELECTORS)
+    except Exception as e:
+        print(f"  Warning: Could not extract generic elements: {e}")
+        return {}
+
+
+# Title, text and generic elements in one evaluate (reuses the script above)
+_SNAPSHOT_JS = f"""(selectors) => ({{
+    title: document.title,
+    text: document.body.innerText,
+    elements: ({_GENERIC_ELEMENTS_JS})(selectors),
+}})"""
+
+# new_scrape_context() installs the snapshot function once per context so
+# each page calls it by name instead of re-sending and re-parsing the source.
+# The call returns null on pages from other contexts.
+_SNAPSHOT_INIT_JS = f"window.__travelSnapshot = {_SNAPSHOT_JS};"
+_CALL_SNAPSHOT_JS = "(args) => window.__travelSnapshot ? window.__travelSnapshot(args) : null"
+
+
+async def extract_page_snapshot(page) -> tuple[str, str, dict[str, list[str]]]:
+    """
+    Read (title, raw_text, generic elements) in a single CDP round-trip
+    (two on pages whose context lacks the preinstalled helper).
+
+    Falls back to the individual helpers if the combined script fails.
+    """
+    try:
+        snap = await page.evaluate(_CALL_SNAPSHOT_JS, GENERIC_SELECTORS)
+        if snap is None:
+            snap = await page.evaluate(_SNAPSHOT_JS, GENERIC_SELECTORS)
+        return snap["title"], snap["text"], snap["elements"]
+    except Exception as e:
+        print(f"  Warning: Page snapshot failed, extracting separately: {e}")
+
+    try:
+        title = await page.title()
+    except Exception:
+        title = ""
+    return (
+        title,
+        await safe_extract_text(page),
+        await extract_generic_elements(page),
+    )
 
-    return extracted
+
+# Package codes in listing hrefs, matched per anchor
+_BESTTOUR_CODE_RE = re.compile(r"/itinerary/([A-Z0-9]+)")
+_LIONTRAVEL_CODE_RE = re.compile(r"/(?:product|detail)/(\d+)")
+_SETTOUR_CODE_RE = re.compile(r"/product/([A-Z0-9]+)", re.IGNORECASE)
+
+
+@lru_cache(maxsize=32)
+def _compile_code_regex(pattern: str) -> re.Pattern:
+    """Compile a config code_regex once; it is applied to every container."""
+    return re.compile(pattern)
+
+
+# [href, innerText] for those of the first 100 anchors whose href contains a
+# package marker, in one round trip. Anchors without innerText (e.g. SVG
+# links) were never matched and are dropped here too.
+_ANCHORS_JS = """(els, markers) => els.slice(0, 100).filter((a) => {
+    const href = a.getAttribute("href");
+    return a instanceof HTMLElement && href && markers.some((m) => href.includes(m));
+}).map((a) => [a.getAttribute("href"), a.innerText])"""
+
+# [title text, price text, code, innerHTML] per listing container, in one
+# round trip. code_regex runs in the page so only the captured code comes
+# back; if JS can't compile it (Python-only syntax), code is null and the
+# container HTML is returned for Python to match instead.
+_CONTAINER_ITEMS_JS = """(els, [titleSel, priceSel, codeRegex]) => {
+    let codeRe = null;
+    try { codeRe = new RegExp(codeRegex); } catch (e) {}
+    return els.map((el) => {
+        const titleEl = el.querySelector(titleSel);
+        const priceEl = el.querySelector(priceSel);
+        const html = el.innerHTML;
+        const m = codeRe && html.match(codeRe);
+        return [
+            titleEl ? titleEl.innerText || "" : "",
+            priceEl ? priceEl.innerText || "" : "",
+            codeRe ? (m && m[1]) || "" : null,
+            codeRe ? "" : html,
+        ];
+    });
+}"""
 
 
 async def _extract_container_based(page, selectors: dict, base_url: str) -> list[dict]:
@@ -245,26 +764,18 @@ async def _extract_container_based(page, selectors: dict, base_url: str) -> list
     url_template = selectors.get("url_template", "")
 
     try:
-        items = await page.query_selector_all(container_sel)
-        for item in items:
+        code_re = _compile_code_regex(code_regex)
+        items = await page.eval_on_selector_all(
+            container_sel, _CONTAINER_ITEMS_JS, [title_sel, price_sel, code_regex]
+        )
+        for title, price_text, code, item_html in items:
             try:
-                # Get title
-                title_el = await item.query_selector(title_sel)
-                title = ""
-                if title_el:
-                    title = await title_el.inner_text()
-                    title = title.strip()[:100]
-
-                # Get price
-                price_el = await item.query_selector(price_sel)
-                price_text = ""
-                if price_el:
-                    price_text = await price_el.inner_text()
-
-                # Get product code from container HTML
-                item_html = await item.inner_html()
-                code_match = re.search(code_regex, item_html)
-                code = code_match.group(1) if code_match else ""
+                title = title.strip()[:100]
+
+                # Product code from container HTML, unless the page matched it
+                if code is None:
+                    code_match = code_re.search(item_html)
+                    code = code_match.group(1) if code_match else ""
 
                 if code and url_template:
                     # Construct product URL from template
@@ -315,27 +826,35 @@ async def extract_package_links(page, base_url: str) -> list[dict]:
         return await _extract_container_based(page, selectors, base_url)
 
     # Standard anchor-based extraction for other OTAs
+    rule = _package_link_rule(base_url)
+    if rule is None:
+        return links
+    href_markers, code_re = rule
+
     try:
-        anchors = await page.query_selector_all("a[href]")
+        anchors = await page.eval_on_selector_all("a[href]", _ANCHORS_JS, list(href_markers))
         seen: set[str] = set()
+        # A repeated href resolves to a URL already in seen; skip it before urljoin
+        seen_hrefs: set[str] = set()
 
-        for anchor in anchors[:100]:
+        for href, text in anchors:
             try:
-                href = await anchor.get_attribute("href")
-                if not href:
+                if href in seen_hrefs:
                     continue
-
-                text = await anchor.inner_text()
                 text = text.strip()[:100] if text else ""
                 full_url = urljoin(base_url, href)
 
                 if full_url in seen:
                     continue
 
-                link_entry = _match_package_link(base_url, href, full_url, text)
-                if link_entry:
-                    seen.add(full_url)
-                    links.append(link_entry)
+                code_match = code_re.search(href) if code_re else None
+                seen.add(full_url)
+                seen_hrefs.add(href)
+                links.append({
+                    "url": full_url,
+                    "code": code_match.group(1) if code_match else "",
+                    "title": text,
+                })
 
             except Exception:
                 continue
@@ -346,39 +865,21 @@ async def extract_package_links(page, base_url: str) -> list[dict]:
     return links
 
 
-def _match_package_link(base_url: str, href: str, full_url: str, text: str) -> dict | None:
-    """Check if a link matches known OTA package URL patterns."""
-    if "besttour.com.tw" in base_url:
-        if "/itinerary/" in href:
-            code_match = re.search(r"/itinerary/([A-Z0-9]+)", href)
-            return {
-                "url": full_url,
-                "code": code_match.group(1) if code_match else "",
-                "title": text,
-            }
-
-    elif "liontravel.com" in base_url:
-        if "/product/" in href or "/detail/" in href:
-            code_match = re.search(r"/(?:product|detail)/(\d+)", href)
-            return {
-                "url": full_url,
-                "code": code_match.group(1) if code_match else "",
-                "title": text,
-            }
-
-    elif "lifetour.com.tw" in base_url:
-        if "/detail" in href:
-            return {"url": full_url, "code": "", "title": text}
-
-    elif "settour.com.tw" in base_url:
-        if "/product/" in href:
-            code_match = re.search(r"/product/([A-Z0-9]+)", href, re.IGNORECASE)
-            return {
-                "url": full_url,
-                "code": code_match.group(1) if code_match else "",
-                "title": text,
-            }
+# Listing URL domain -> (href substrings marking a package link, pattern for
+# the package code or None), tried in order
+_PACKAGE_LINK_RULES: dict[str, tuple[tuple[str, ...], re.Pattern | None]] = {
+    "besttour.com.tw": (("/itinerary/",), _BESTTOUR_CODE_RE),
+    "liontravel.com": (("/product/", "/detail/"), _LIONTRAVEL_CODE_RE),
+    "lifetour.com.tw": (("/detail",), None),
+    "settour.com.tw": (("/product/",), _SETTOUR_CODE_RE),
+}
+
 
+def _package_link_rule(base_url: str) -> tuple[tuple[str, ...], re.Pattern | None] | None:
+    """Pick the link rule for a listing URL once, before walking its anchors."""
+    for domain, rule in _PACKAGE_LINK_RULES.items():
+        if domain in base_url:
+            return rule
     return None
 
 
@@ -421,54 +922,69 @@ class BaseScraper(ABC):
         Full scrape: navigate, prepare, extract, parse.
 
         Uses navigate_with_retry for reliable page loading.
-        Supports caching via use_cache kwarg.
+        Supports caching via use_cache kwarg; with reparse=True a cache hit
+        is re-parsed from its stored page text instead of returned as-is.
         """
         from .cache import get_cache
         
         use_cache = kwargs.pop("use_cache", True)
+        reparse = kwargs.pop("reparse", False)
         cache = get_cache()
         
         # Try cache first
         if use_cache:
             cached = cache.get(self.source_id, url, **kwargs)
             if cached:
-                return cached
+                return self.reparse(cached, **kwargs) if reparse else cached
         
         result = ScrapeResult(
             source_id=self.source_id,
             url=url,
-            scraped_at=datetime.now().isoformat(),
+            scraped_at=now_iso(),
         )
 
         # Navigate
-        success = await navigate_with_retry(page, url)
+        success = await navigate_with_retry(
+            page, url, timeout=30000, ready_selector=CONTENT_READY_SELECTOR
+        )
         if not success:
             result.success = False
             result.errors.append(f"Failed to navigate to {url} after retries")
             return result
 
-        # Wait for initial content
-        await page.wait_for_timeout(3000)
-
         # OTA-specific preparation (tabs, scrolling, etc.)
         await self.prepare_page(page, url)
 
-        # Extract page title
-        try:
-            result.title = await page.title()
-        except Exception:
-            pass
-
-        # Extract raw text
-        result.raw_text = await safe_extract_text(page)
-
-        # Extract generic CSS elements
-        result.extracted_elements = await extract_generic_elements(page)
+        # Extract title, raw text and generic CSS elements
+        result.title, result.raw_text, result.extracted_elements = (
+            await extract_page_snapshot(page)
+        )
 
         # Extract package links
         result.package_links = await extract_package_links(page, url)
 
-        # Run OTA-specific parsing
+        # Run OTA-specific parsing off the event loop so concurrent scrapes keep progressing
+        await asyncio.to_thread(self._apply_parse, result, url, **kwargs)
+
+        # Cache the result
+        if use_cache:
+            cache.set(result, **kwargs)
+
+        return result
+
+    def reparse(self, result: ScrapeResult, **kwargs) -> ScrapeResult:
+        """
+        Re-run parse_raw_text on a result's stored raw_text, in place.
+
+        Lets a cached scrape pick up parser changes without a browser.
+        """
+        result.baggage_included = None
+        result.baggage_kg = None
+        self._apply_parse(result, result.url, **kwargs)
+        return result
+
+    def _apply_parse(self, result: ScrapeResult, url: str, **kwargs) -> None:
+        """Parse result.raw_text and merge parsed + derived fields into result."""
         parsed = self.parse_raw_text(result.raw_text, url=url, **kwargs)
 
         # Merge parsed data into result
@@ -496,8 +1012,3 @@ class BaseScraper(ABC):
                     region,
                 )
         
-        # Cache the result
-        if use_cache:
-            cache.set(result, **kwargs)
-
-        return result
@@ -10,12 +10,18 @@ from __future__ import annotations
 import hashlib
 import json
 import os
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 
 from .schema import ScrapeResult
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class ScrapeCache:
     """File-based cache for scrape results with TTL."""
@@ -47,12 +53,14 @@ class ScrapeCache:
         cache_key = self._cache_key(source_id, url, **kwargs)
         cache_path = self._cache_path(cache_key)
         
-        if not cache_path.exists():
-            return None
-        
         try:
-            with open(cache_path, encoding="utf-8") as f:
-                data = json.load(f)
+            with open(cache_path, "rb") as f:
+                # Files are written after the scrape, so a file older than the
+                # TTL holds an expired result; skip reading it
+                if time.time() - os.fstat(f.fileno()).st_mtime > self.default_ttl.total_seconds():
+                    return None
+                raw = f.read()
+            data = orjson.loads(raw) if orjson is not None else json.loads(raw)
             
             # Check expiry
             scraped_at = data.get("scraped_at", "")
@@ -67,6 +75,8 @@ class ScrapeCache:
             result.warnings.append(f"Loaded from cache (age: {self._age_str(scraped_at)})")
             return result
             
+        except FileNotFoundError:
+            return None
         except Exception as e:
             print(f"  Cache read error: {e}")
             return None
@@ -83,8 +93,13 @@ class ScrapeCache:
         try:
             # Use to_dict() to preserve source_id, errors, warnings
             data = result.to_dict()
-            with open(cache_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            # Compact: entries are only read back by get(); raw_text dominates
+            # the size and indentation would only add to it
+            if orjson is not None:
+                cache_path.write_bytes(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
+            else:
+                with open(cache_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
         except Exception as e:
             print(f"  Cache write error: {e}")
     
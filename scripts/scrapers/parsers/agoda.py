@@ -82,6 +82,37 @@ def build_search_url(
     )
 
 
+# Precompiled patterns (the hotel helpers run them line by line)
+_EN_NAME_RE = re.compile(
+    r"\(([A-Za-z\s&'-]+(?:Hotel|Inn|Resort|Hostel|House|Suites?)[A-Za-z\s&'-]*)\)"
+)
+_ZH_NAME_RE = re.compile(r"^(.+?)\s*\(")
+_STAR_RE = re.compile(r"獲得(\d)顆星")
+_LODGING_RE = re.compile(r"(飯店|酒店|旅館|民宿|青旅)")
+_AREA_RE = re.compile(r"(心齋橋|難波|梅田|日本橋|天王寺|新宿|池袋|澀谷|淺草|銀座|上野)")
+_NT_PRICE_RE = re.compile(r"NT\$\s*([\d,]+)")
+_TWD_PRICE_RE = re.compile(r"TWD\s*([\d,]+)")
+_CHECKIN_RE = re.compile(r"checkIn=(\d{4}-\d{2}-\d{2})")
+_CHECKOUT_RE = re.compile(r"checkOut=(\d{4}-\d{2}-\d{2})")
+_LOS_RE = re.compile(r"los=(\d+)")
+_NIGHTS_RE = re.compile(r"(\d+)\s*晚")
+
+_AMENITY_KEYWORDS = (
+    "免費Wi-Fi", "WiFi", "游泳池", "健身房", "停車場", "機場接駁",
+    "早餐", "餐廳", "溫泉", "大浴場", "洗衣", "行李寄存",
+)
+# One scan finds every keyword, except that matches don't overlap: a keyword
+# that can start inside another (餐廳 in 早餐廳) gets a substring check too
+_AMENITY_RE = re.compile("|".join(map(re.escape, _AMENITY_KEYWORDS)))
+_AMENITY_OVERLAPPING = tuple(
+    kw for kw in _AMENITY_KEYWORDS
+    if any(
+        other != kw and (kw in other or any(other.endswith(kw[:i]) for i in range(1, len(kw))))
+        for other in _AMENITY_KEYWORDS
+    )
+)
+
+
 # Known Agoda city IDs
 CITY_IDS = {
     "osaka": 14811,
@@ -124,58 +155,53 @@ def _parse_hotel(raw_text: str) -> HotelInfo:
     """Parse hotel info from Agoda page text."""
     hotel = HotelInfo()
 
-    lines = [l.strip() for l in raw_text.split("\n") if l.strip()]
-
-    # Look for hotel name in parentheses (English name) — most reliable
-    for line in lines:
-        name_match = re.search(
-            r"\(([A-Za-z\s&'-]+(?:Hotel|Inn|Resort|Hostel|House|Suites?)[A-Za-z\s&'-]*)\)",
-            line,
-        )
-        if name_match:
-            en_name = name_match.group(1).strip()
-            hotel.names.append(en_name)
-            # The Chinese name is typically on the same line before the parentheses
-            zh_match = re.match(r"^(.+?)\s*\(", line)
-            if zh_match:
-                zh_name = zh_match.group(1).strip()
-                hotel.name = zh_name
-                hotel.names.insert(0, zh_name)
-            else:
-                hotel.name = en_name
-            break
-
-    # Look for star rating
-    for line in lines:
-        star_match = re.search(r"獲得(\d)顆星", line)
-        if star_match:
-            hotel.star_rating = int(star_match.group(1))
-            break
-
-    # If no English name found, try Chinese hotel name pattern
-    if not hotel.name:
-        for i, line in enumerate(lines):
-            if re.search(r"(飯店|酒店|旅館|民宿|青旅)", line) and len(line) > 4:
+    # One walk over the lines, keeping the first line that matches each field
+    en_match = zh_line = star_match = area_line = None
+    for line in map(str.strip, raw_text.split("\n")):
+        if not line:
+            continue
+        # Hotel name in parentheses (English name) — most reliable
+        if en_match is None:
+            en_match = _EN_NAME_RE.search(line)
+            if en_match:
+                en_line = line
+            # Chinese hotel name pattern, used if no English name turns up
+            elif zh_line is None and _LODGING_RE.search(line) and len(line) > 4:
                 # Skip navigation/section headers
                 if line not in ("簡介", "旅遊好去處", "設施與服務", "住宿評鑑", "地點", "政策"):
-                    hotel.name = line
-                    break
-
-    # Extract address / area
-    for line in lines:
-        if re.search(r"(心齋橋|難波|梅田|日本橋|天王寺|新宿|池袋|澀谷|淺草|銀座|上野)", line):
-            # This line likely contains area info
-            hotel.area = line[:100]
+                    zh_line = line
+        if star_match is None:
+            star_match = _STAR_RE.search(line)
+        # Address / area
+        if area_line is None and _AREA_RE.search(line):
+            area_line = line
+        if en_match and star_match and area_line is not None:
             break
 
-    # Extract amenities
-    amenity_keywords = [
-        "免費Wi-Fi", "WiFi", "游泳池", "健身房", "停車場", "機場接駁",
-        "早餐", "餐廳", "溫泉", "大浴場", "洗衣", "行李寄存",
-    ]
-    for kw in amenity_keywords:
-        if kw in raw_text:
-            hotel.amenities.append(kw)
+    if en_match:
+        en_name = en_match.group(1).strip()
+        hotel.names.append(en_name)
+        # The Chinese name is typically on the same line before the parentheses
+        zh_match = _ZH_NAME_RE.match(en_line)
+        if zh_match:
+            zh_name = zh_match.group(1).strip()
+            hotel.name = zh_name
+            hotel.names.insert(0, zh_name)
+        else:
+            hotel.name = en_name
+    elif zh_line is not None:
+        hotel.name = zh_line
+
+    if star_match:
+        hotel.star_rating = int(star_match.group(1))
+
+    if area_line is not None:
+        hotel.area = area_line[:100]
+
+    # Extract amenities, in keyword order
+    found = {m.group() for m in _AMENITY_RE.finditer(raw_text)}
+    found.update(kw for kw in _AMENITY_OVERLAPPING if kw not in found and kw in raw_text)
+    hotel.amenities.extend(kw for kw in _AMENITY_KEYWORDS if kw in found)
 
     return hotel
 
@@ -185,9 +211,9 @@ def _parse_price(raw_text: str) -> PriceInfo:
     price = PriceInfo(currency="TWD")
 
     # Look for price patterns: NT$ X,XXX or TWD X,XXX
-    price_matches = re.findall(r"NT\$\s*([\d,]+)", raw_text)
+    price_matches = _NT_PRICE_RE.findall(raw_text)
     if not price_matches:
-        price_matches = re.findall(r"TWD\s*([\d,]+)", raw_text)
+        price_matches = _TWD_PRICE_RE.findall(raw_text)
 
     if price_matches:
         prices = sorted(set(int(p.replace(",", "")) for p in price_matches))
@@ -204,20 +230,20 @@ def _parse_dates(raw_text: str, url: str = "") -> DatesInfo:
     dates = DatesInfo()
 
     # Extract from URL params
-    checkin_match = re.search(r"checkIn=(\d{4}-\d{2}-\d{2})", url)
+    checkin_match = _CHECKIN_RE.search(url)
     if checkin_match:
         dates.departure_date = checkin_match.group(1)
 
-    checkout_match = re.search(r"checkOut=(\d{4}-\d{2}-\d{2})", url)
+    checkout_match = _CHECKOUT_RE.search(url)
     if checkout_match:
         dates.return_date = checkout_match.group(1)
 
-    los_match = re.search(r"los=(\d+)", url)
+    los_match = _LOS_RE.search(url)
     if los_match:
         dates.duration_nights = int(los_match.group(1))
 
     # Extract from text
-    duration_match = re.search(r"(\d+)\s*晚", raw_text)
+    duration_match = _NIGHTS_RE.search(raw_text)
     if duration_match and not dates.duration_nights:
         dates.duration_nights = int(duration_match.group(1))
 
@@ -10,13 +10,68 @@ from __future__ import annotations
 import re
 from typing import Optional, Tuple
 
-from ..base import BaseScraper, scroll_page
+from ..base import BaseScraper, compile_spaced_keywords, scroll_page
 from ..schema import (
     ScrapeResult, FlightInfo, FlightSegment, HotelInfo,
     PriceInfo, DatePricing, DatesInfo,
 )
 
 
+# Precompiled patterns (parse helpers run once per page over the full text)
+_AIRPORT_CODE_RE = re.compile(r"\(([A-Z]{3})\)")
+# 去程/回程 marker line plus the eight block lines; the lookahead leaves the
+# block unconsumed so a marker inside a short block is still found
+_FLIGHT_BLOCK_RE = re.compile(
+    r"^[^\S\n]*(去程|回程)[^\S\n]*$(?=" + r"\n([^\n]*)" * 8 + r")",
+    re.MULTILINE,
+)
+_YMD_RE = re.compile(r"(\d{4})[/-](\d{1,2})[/-](\d{1,2})")
+_WS = r"[^\S\n]*"
+# Hotel section headings, the headings that end it, and meta lines to skip
+_HOTEL_HEADINGS = ("住宿", "飯店", "旅館", "酒店")
+_HOTEL_STOP_LABELS = ("交通方式", "行程內容", "出發日期", "費用說明")
+_HOTEL_META_RE = re.compile(r"^(地區|區域|地址|電話|入住|退房)[:：]")
+_AREA_RE = re.compile(rf"(地區|區域)[:：]{_WS}(\S[^\n]*)$", re.MULTILINE)
+# Access: whole lines mentioning a transit line and a walking time
+_ACCESS_LINE_RE = re.compile(
+    r"^(?=[^\n]*?(?:JR|地鐵|捷運|單軌|Monorail|Yurikamome|ゆりかもめ))"
+    rf"(?=[^\n]*?\d+{_WS}(?:分|分鐘|min))[^\n]*",
+    re.MULTILINE | re.IGNORECASE,
+)
+# Calendar rows are matched over the whole text; each match starts at its line
+# start and takes only the first hit on that line. The leading lookahead grabs
+# the first 可售<n> seat count anywhere on the same line (group 1, "seats").
+_SEATS_AHEAD = rf"(?=(?:[^\n]*?可售[:：]?{_WS}(?P<seats>\d+))?)"
+_FULL_DATE_RE = re.compile(
+    rf"^{_SEATS_AHEAD}[^\n]*?(\d{{4}})[/-](\d{{1,2}})[/-](\d{{1,2}}).{{0,20}}?"
+    r"(可售|滿團|候補|額滿|已滿|停售|關團).{0,30}?([0-9]{4,6})",
+    re.MULTILINE,
+)
+_DAY_LINE_RE = re.compile(
+    rf"^{_SEATS_AHEAD}[^\S\n]*(\d{{1,2}})[^\S\n]*(可售|滿團|候補|額滿|已滿|停售|關團).{{0,40}}?([0-9]{{4,6}})",
+    re.MULTILINE,
+)
+_AVAILABILITY_RE = re.compile(r"可售|滿團|候補|額滿|已滿|停售|關團")
+_FIT_RE = re.compile(r"機加酒|自由行|機\+酒")
+_GROUP_RE = re.compile(r"團體|跟團|領隊|導遊")
+# Every phrase contains 早餐, so one match implies the bare keyword too
+_BREAKFAST_RE = compile_spaced_keywords("含早餐", "包含早餐", "附早餐", "輕食早餐", "簡易早餐")
+# 交通方式 tab locators by preference. A tier's selectors are OR'd into one
+# query, which resolves in DOM order, so the exact tab label and the broader
+# 交通 text (which also hits nav links and 交通資訊 headings) get tiers of
+# their own; only the last-resort structural fallbacks share one.
+_TRANSPORT_TAB_TIERS = (
+    ("text=交通方式",),
+    ("text=交通",),
+    (
+        "[class*='tab']:has-text('交通')",
+        "button:has-text('交通')",
+        "a:has-text('交通')",
+        "div:has-text('交通方式')",
+    ),
+)
+
+
 class BestTourParser(BaseScraper):
     source_id = "besttour"
 
@@ -25,37 +80,41 @@ class BestTourParser(BaseScraper):
         await scroll_page(page)
 
         print("BestTour detected: clicking 交通方式 tab...")
-        tab_selectors = [
-            "text=交通方式",
-            "text=交通",
-            "[class*='tab']:has-text('交通')",
-            "button:has-text('交通')",
-            "a:has-text('交通')",
-            "div:has-text('交通方式')",
-        ]
-        for selector in tab_selectors:
+        for tier in _TRANSPORT_TAB_TIERS:
+            tab = page.locator(tier[0])
+            for selector in tier[1:]:
+                tab = tab.or_(page.locator(selector))
             try:
-                tab = await page.query_selector(selector)
-                if tab:
-                    await tab.click()
-                    print(f"  Clicked tab with selector: {selector}")
-                    await page.wait_for_timeout(2000)
-                    break
+                tab = tab.first
+                if not await tab.count():
+                    continue
+                await tab.click()
+                print(f"  Clicked tab with selector: {' | '.join(tier)}")
             except Exception:
                 continue
+            # Flight block renders with a 去程 line; don't sleep past it
+            try:
+                await page.wait_for_selector("text=去程", timeout=2000)
+            except Exception:
+                pass
+            break
 
     def parse_raw_text(self, raw_text: str, url: str = "", **kwargs) -> ScrapeResult:
         """Parse BestTour page text into structured data."""
         result = ScrapeResult(source_id=self.source_id, url=url)
 
-        result.flight = _parse_flights(raw_text)
+        # Cheap substring guards skip the line walks when the 交通方式 tab or
+        # the price calendar never rendered
+        if "去程" in raw_text or "回程" in raw_text:
+            result.flight = _parse_flights(raw_text)
         result.hotel = _parse_hotel(raw_text)
         result.inclusions = _parse_inclusions(raw_text)
 
         ym = _infer_year_month_from_flight_date(
             result.flight.outbound.date
         )
-        result.date_pricing = _parse_date_pricing(raw_text, year_month=ym)
+        if _AVAILABILITY_RE.search(raw_text):
+            result.date_pricing = _parse_date_pricing(raw_text, year_month=ym)
         
         # Package type classification
         result.package_type = _classify_package_type(raw_text, url)
@@ -70,54 +129,45 @@ class BestTourParser(BaseScraper):
 def _parse_flights(raw_text: str) -> FlightInfo:
     """Parse 交通方式 section for flight details."""
     flight_info = FlightInfo()
-    lines = raw_text.split("\n")
 
-    for i, line in enumerate(lines):
-        line = line.strip()
-
-        if line == "去程" and i + 8 < len(lines):
-            flight_info.outbound = _parse_flight_block(lines, i)
-
-        elif line == "回程" and i + 8 < len(lines):
-            flight_info.return_ = _parse_flight_block(lines, i)
+    for m in _FLIGHT_BLOCK_RE.finditer(raw_text):
+        if m.group(1) == "去程":
+            flight_info.outbound = _parse_flight_block(m)
+        else:
+            flight_info.return_ = _parse_flight_block(m)
             break  # Found both, done
 
     return flight_info
 
 
-def _parse_flight_block(lines: list[str], start: int) -> FlightSegment:
+def _parse_flight_block(m: re.Match) -> FlightSegment:
     """
-    Parse a flight block starting at '去程' or '回程'.
-
-    Expected layout:
-      [start]   去程/回程
-      [start+1] date
-      [start+2] flight_number
-      [start+3] airline
-      [start+4] departure_airport(CODE)
-      [start+5] departure_time
-      [start+6] →
-      [start+7] arrival_airport(CODE)
-      [start+8] arrival_time
+    Build a segment from a _FLIGHT_BLOCK_RE match at '去程' or '回程'.
+
+    Expected layout (one group per line):
+      [1] 去程/回程
+      [2] date
+      [3] flight_number
+      [4] airline
+      [5] departure_airport(CODE)
+      [6] departure_time
+      [7] →
+      [8] arrival_airport(CODE)
+      [9] arrival_time
     """
-    try:
-        segment = FlightSegment(
-            date=lines[start + 1].strip() if start + 1 < len(lines) else "",
-            flight_number=lines[start + 2].strip() if start + 2 < len(lines) else "",
-            airline=lines[start + 3].strip() if start + 3 < len(lines) else "",
-            departure_airport=lines[start + 4].strip() if start + 4 < len(lines) else "",
-            departure_time=lines[start + 5].strip() if start + 5 < len(lines) else "",
-            arrival_airport=lines[start + 7].strip() if start + 7 < len(lines) else "",
-            arrival_time=lines[start + 8].strip() if start + 8 < len(lines) else "",
-        )
-    except IndexError as e:
-        import warnings
-        warnings.warn(f"BestTour flight block parse error at line {start}: {e}")
-        return FlightSegment()
+    segment = FlightSegment(
+        date=m.group(2).strip(),
+        flight_number=m.group(3).strip(),
+        airline=m.group(4).strip(),
+        departure_airport=m.group(5).strip(),
+        departure_time=m.group(6).strip(),
+        arrival_airport=m.group(8).strip(),
+        arrival_time=m.group(9).strip(),
+    )
 
     # Extract airport codes from e.g. "桃園(TPE)"
-    dep_match = re.search(r"\(([A-Z]{3})\)", segment.departure_airport)
-    arr_match = re.search(r"\(([A-Z]{3})\)", segment.arrival_airport)
+    dep_match = _AIRPORT_CODE_RE.search(segment.departure_airport)
+    arr_match = _AIRPORT_CODE_RE.search(segment.arrival_airport)
     if dep_match:
         segment.departure_code = dep_match.group(1)
     if arr_match:
@@ -130,7 +180,7 @@ def _infer_year_month_from_flight_date(date_str: str) -> Optional[Tuple[int, int
     """Infer (year, month) from BestTour flight date strings like '2026/02/13(五)'."""
     if not date_str:
         return None
-    m = re.search(r"(\d{4})[/-](\d{1,2})[/-](\d{1,2})", date_str)
+    m = _YMD_RE.search(date_str)
     if not m:
         return None
     return int(m.group(1)), int(m.group(2))
@@ -139,11 +189,11 @@ def _infer_year_month_from_flight_date(date_str: str) -> Optional[Tuple[int, int
 def _classify_package_type(raw_text: str, url: str) -> str:
     """Classify BestTour package type based on content."""
     # FIT indicators
-    if any(kw in raw_text for kw in ["機加酒", "自由行", "機+酒"]):
+    if _FIT_RE.search(raw_text):
         return "fit"
     
     # Group tour indicators
-    if any(kw in raw_text for kw in ["團體", "跟團", "領隊", "導遊"]):
+    if _GROUP_RE.search(raw_text):
         return "group"
     
     # Flight only
@@ -159,19 +209,18 @@ def _classify_package_type(raw_text: str, url: str) -> str:
 
 def _parse_hotel(raw_text: str) -> HotelInfo:
     """Parse hotel section from raw page text (heuristic)."""
-    lines = [l.strip() for l in raw_text.split("\n")]
     hotel = HotelInfo()
+    lines = [l.strip() for l in raw_text.split("\n")]
 
     # Heuristic: find a '住宿' section and take the next meaningful line as name
     for i, line in enumerate(lines):
-        if line in ("住宿", "飯店", "旅館", "酒店") and i + 1 < len(lines):
-            for j in range(i + 1, min(i + 25, len(lines))):
-                candidate = lines[j].strip()
+        if line in _HOTEL_HEADINGS:
+            for candidate in lines[i + 1:i + 25]:
                 if not candidate:
                     continue
-                if candidate in ("交通方式", "行程內容", "出發日期", "費用說明"):
+                if candidate in _HOTEL_STOP_LABELS:
                     break
-                if re.match(r"^(地區|區域|地址|電話|入住|退房)[:：]", candidate):
+                if _HOTEL_META_RE.match(candidate):
                     continue
                 if len(candidate) >= 4:
                     hotel.name = candidate
@@ -180,21 +229,19 @@ def _parse_hotel(raw_text: str) -> HotelInfo:
                 break
 
     # Area label extraction
-    for line in lines:
-        m = re.search(r"(地區|區域)[:：]\s*(.+)$", line)
-        if m:
-            hotel.area = m.group(2).strip()
-            break
-
-    # Access: collect transit lines with minutes
-    access = []
-    for line in lines:
-        if (
-            re.search(r"(JR|地鐵|捷運|單軌|Monorail|Yurikamome|ゆりかもめ)", line, re.IGNORECASE)
-            and re.search(r"(\d+)\s*(分|分鐘|min)", line, re.IGNORECASE)
-        ):
-            access.append(line.strip())
-    hotel.access = list(dict.fromkeys(access))[:8]
+    m = _AREA_RE.search(raw_text)
+    if m:
+        hotel.area = m.group(2).strip()
+
+    # Access: first 8 distinct transit lines with minutes
+    seen: set[str] = set()
+    for m in _ACCESS_LINE_RE.finditer(raw_text):
+        line = m.group().strip()
+        if line not in seen:
+            seen.add(line)
+            hotel.access.append(line)
+            if len(hotel.access) == 8:
+                break
 
     return hotel
 
@@ -216,28 +263,21 @@ def _parse_date_pricing(
             return "limited"
         return "limited"
 
+    def seats(m: re.Match) -> Optional[int]:
+        return int(m.group("seats")) if m.group("seats") else None
+
     pricing: dict[str, DatePricing] = {}
-    lines = [l.strip() for l in raw_text.split("\n") if l.strip()]
 
     # Prefer full-date matches
-    full_date_re = re.compile(
-        r"(\d{4})[/-](\d{1,2})[/-](\d{1,2}).{0,20}?"
-        r"(可售|滿團|候補|額滿|已滿|停售|關團).{0,30}?([0-9]{4,6})"
-    )
-    for line in lines:
-        m = full_date_re.search(line)
-        if not m:
-            continue
-        y, mo, d = int(m.group(1)), int(m.group(2)), int(m.group(3))
-        label = m.group(4)
-        price = int(m.group(5))
-        seats_match = re.search(r"可售[:：]?\s*(\d+)", line)
-        seats = int(seats_match.group(1)) if seats_match else None
+    for m in _FULL_DATE_RE.finditer(raw_text):
+        y, mo, d = int(m.group(2)), int(m.group(3)), int(m.group(4))
+        label = m.group(5)
+        price = int(m.group(6))
         pricing[to_iso(y, mo, d)] = DatePricing(
             date=to_iso(y, mo, d),
             price=price,
             availability=map_availability(label),
-            seats_remaining=seats,
+            seats_remaining=seats(m),
         )
 
     if pricing:
@@ -247,23 +287,15 @@ def _parse_date_pricing(
     if not year_month:
         return pricing
     y, mo = year_month
-    day_line_re = re.compile(
-        r"^(\d{1,2})\s*(可售|滿團|候補|額滿|已滿|停售|關團).{0,40}?([0-9]{4,6})"
-    )
-    for line in lines:
-        m = day_line_re.match(line)
-        if not m:
-            continue
-        d = int(m.group(1))
-        label = m.group(2)
-        price = int(m.group(3))
-        seats_match = re.search(r"可售[:：]?\s*(\d+)", line)
-        seats = int(seats_match.group(1)) if seats_match else None
+    for m in _DAY_LINE_RE.finditer(raw_text):
+        d = int(m.group(2))
+        label = m.group(3)
+        price = int(m.group(4))
         pricing[to_iso(y, mo, d)] = DatePricing(
             date=to_iso(y, mo, d),
             price=price,
             availability=map_availability(label),
-            seats_remaining=seats,
+            seats_remaining=seats(m),
         )
 
     return pricing
@@ -272,13 +304,6 @@ def _parse_date_pricing(
 def _parse_inclusions(raw_text: str) -> list[str]:
     """Extract inclusions like breakfast from BestTour text."""
     inclusions = []
-    text = raw_text.replace(" ", "")
-    if "早餐" in text and (
-        "含早餐" in text
-        or "包含早餐" in text
-        or "附早餐" in text
-        or "輕食早餐" in text
-        or "簡易早餐" in text
-    ):
+    if _BREAKFAST_RE.search(raw_text):
         inclusions.append("light_breakfast")
     return inclusions
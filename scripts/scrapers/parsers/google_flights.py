@@ -151,7 +151,7 @@ def parse_flight_results(raw_text: str) -> list[dict]:
         來回票價
     """
     flights: list[dict] = []
-    lines = [l.strip() for l in raw_text.split("\n") if l.strip()]
+    lines = [l for l in map(str.strip, raw_text.split("\n")) if l]
 
     i = 0
     while i < len(lines):
@@ -23,11 +23,13 @@ class LifetourParser(BaseScraper):
         """Parse Lifetour page text into structured data."""
         result = ScrapeResult(source_id=self.source_id, url=url)
 
-        result.flight = _parse_flights(raw_text)
-        result.hotel = _parse_hotel(raw_text)
+        # Split once; the line-walking helpers share it
+        lines = raw_text.split("\n")
+        result.flight = _parse_flights(lines)
+        result.hotel = _parse_hotel(lines)
         result.price = _parse_price(raw_text)
         result.dates = _parse_dates(raw_text)
-        result.itinerary = _parse_itinerary(raw_text)
+        result.itinerary = _parse_itinerary(lines)
         result.inclusions = _parse_inclusions(raw_text)
         result.package_type = _classify_package_type(raw_text, url)
 
@@ -38,10 +40,9 @@ class LifetourParser(BaseScraper):
 # Pure parsing functions
 # ---------------------------------------------------------------------------
 
-def _parse_flights(raw_text: str) -> FlightInfo:
-    """Parse Lifetour flight details from raw page text."""
+def _parse_flights(lines: list[str]) -> FlightInfo:
+    """Parse Lifetour flight details from the page text lines."""
     flight_info = FlightInfo()
-    lines = raw_text.split("\n")
 
     for i, line in enumerate(lines):
         line = line.strip()
@@ -83,10 +84,9 @@ def _parse_flights(raw_text: str) -> FlightInfo:
     return flight_info
 
 
-def _parse_hotel(raw_text: str) -> HotelInfo:
-    """Parse Lifetour hotel details from raw page text."""
+def _parse_hotel(lines: list[str]) -> HotelInfo:
+    """Parse Lifetour hotel details from the page text lines."""
     hotel = HotelInfo()
-    lines = raw_text.split("\n")
     in_hotel_section = False
 
     for line in lines:
@@ -212,10 +212,9 @@ def _classify_package_type(raw_text: str, url: str) -> str:
     return "unknown"
 
 
-def _parse_itinerary(raw_text: str) -> list[ItineraryDay]:
-    """Parse daily itinerary from raw page text."""
+def _parse_itinerary(lines: list[str]) -> list[ItineraryDay]:
+    """Parse daily itinerary from the page text lines."""
     itinerary = []
-    lines = raw_text.split("\n")
 
     current_day = None
     current_content: list[str] = []
@@ -10,7 +10,7 @@ from __future__ import annotations
 import re
 from datetime import datetime, timedelta
 
-from ..base import BaseScraper
+from ..base import BaseScraper, now_iso
 from ..schema import ScrapeResult, PriceInfo, DatesInfo, FlightInfo, FlightSegment, HotelInfo
 
 
@@ -75,7 +75,7 @@ class LionTravelParser(BaseScraper):
         result = ScrapeResult(
             source_id=self.source_id,
             url=url,
-            scraped_at=datetime.now().isoformat(),
+            scraped_at=now_iso(),
         )
         result.dates = DatesInfo(
             duration_days=days,
@@ -134,7 +134,7 @@ class LionTravelParser(BaseScraper):
         result = ScrapeResult(
             source_id=self.source_id,
             url=url,
-            scraped_at=datetime.now().isoformat(),
+            scraped_at=now_iso(),
         )
 
         success = await navigate_with_retry(page, url)
@@ -341,6 +341,18 @@ def _parse_search_hotel(raw_text: str) -> HotelInfo:
     return hotel
 
 
+# Card text, title and href for the first 10 matches, read in one round trip
+_PACKAGE_CARDS_JS = """(els) => [els.length, els.slice(0, 10).map((el) => {
+    const titleEl = el.querySelector("h2, h3, .title, [class*='title'], a");
+    const linkEl = el.querySelector("a[href]");
+    return {
+        text: el.innerText || "",
+        title: titleEl ? titleEl.innerText || "" : "",
+        link: linkEl ? linkEl.getAttribute("href") : "",
+    };
+})]"""
+
+
 async def _extract_packages_from_dom(page) -> list[dict]:
     """Extract package cards from the DOM."""
     packages = []
@@ -357,40 +369,31 @@ async def _extract_packages_from_dom(page) -> list[dict]:
     price_pattern = r"TWD\s*([\d,]+)"
 
     for selector in package_selectors:
-        elements = await page.query_selector_all(selector)
-        if not elements:
+        try:
+            count, cards = await page.eval_on_selector_all(
+                selector, _PACKAGE_CARDS_JS
+            )
+        except Exception:
+            continue
+        if not count:
             continue
 
-        print(f"Found {len(elements)} elements with selector: {selector}")
-        for i, el in enumerate(elements[:10]):
-            try:
-                item_text = await el.inner_text()
-                if "TWD" not in item_text and "自由行" not in item_text:
-                    continue
-
-                item_prices = re.findall(price_pattern, item_text)
-
-                title = ""
-                title_el = await el.query_selector(
-                    "h2, h3, .title, [class*='title'], a"
-                )
-                if title_el:
-                    title = await title_el.inner_text()
-
-                link = ""
-                link_el = await el.query_selector("a[href]")
-                if link_el:
-                    link = await link_el.get_attribute("href")
-
-                packages.append({
-                    "index": i,
-                    "title": title.strip()[:100] if title else "",
-                    "prices_found": item_prices[:3],
-                    "link": link,
-                    "text_preview": item_text[:300],
-                })
-            except Exception:
+        print(f"Found {count} elements with selector: {selector}")
+        for i, card in enumerate(cards):
+            item_text = card["text"]
+            if "TWD" not in item_text and "自由行" not in item_text:
                 continue
+
+            item_prices = re.findall(price_pattern, item_text)
+            title = card["title"]
+
+            packages.append({
+                "index": i,
+                "title": title.strip()[:100] if title else "",
+                "prices_found": item_prices[:3],
+                "link": card["link"],
+                "text_preview": item_text[:300],
+            })
         break  # Found working selector
 
     return packages
@@ -9,13 +9,46 @@ from __future__ import annotations
 
 import re
 
-from ..base import BaseScraper, scroll_page
+from ..base import BaseScraper, compile_spaced_keywords, match_keyword, scroll_page
 from ..schema import (
     ScrapeResult, FlightInfo, FlightSegment, HotelInfo,
     PriceInfo, DatesInfo, ItineraryDay,
 )
 
 
+# Precompiled patterns (parse helpers run once per page over the full text)
+_FLIGHT_NO_RE = re.compile(r"([A-Z]{2})\s*(\d{2,4})")
+_NEARBY_AIRPORT_RE = re.compile(r"TPE|NRT|HND|KIX|OSA|NGO")
+_AIRPORT_RE = re.compile(r"(TPE|NRT|HND|KIX|OSA|NGO|CTS|FUK|OKA)")
+_TIME_RE = re.compile(r"(\d{2}:\d{2})")
+_DATE_RE = re.compile(r"(\d{4})[/-](\d{1,2})[/-](\d{1,2})")
+_AIRLINE_RE = re.compile(r"(中華航空|長榮航空|星宇航空|台灣虎航|樂桃航空|酷航|捷星|亞洲航空)")
+_HOTEL_RE = re.compile(r"(Hotel|飯店|酒店|旅館|Inn|Resort|HOTEL)", re.IGNORECASE)
+_HOTEL_SPLIT_RE = re.compile(r"或\s*同級|或\s*")
+_PAREN_RE = re.compile(r"\s*\([^)]*\)")
+_SAME_CLASS_RE = re.compile(r"(或同級|同級)")
+# Searched over the unstripped text, one line at a time (no match across
+# newlines): a label followed only by spaces still counts, with an empty area
+_AREA_RE = re.compile(r"(地區|區域)[:：][^\S\n]*(.+)$", re.MULTILINE)
+_PRICE_RE = re.compile(r"(?:售價|團費|價格)\s*(?:NT)?\$\s*([\d,]+)")
+_NT_RE = re.compile(r"NT?\$\s*([\d,]+)")
+_DEPOSIT_RE = re.compile(r"訂金\s*(?:NT)?\$\s*([\d,]+)")
+_DURATION_RE = re.compile(r"(\d+)\s*天\s*(\d+)\s*夜")
+_DEPART_RE = re.compile(r"出發日期\s*[:：]?\s*(\d{4})[/-](\d{1,2})[/-](\d{1,2})")
+_DAY_HEADER_RE = re.compile(r"^(?:Day|DAY|第)\s*(\d+)\s*(?:天)?$")
+_HOTEL_SECTION_LABELS = frozenset({"飯店安排", "住宿安排", "住宿"})
+_HOTEL_STOP_LABELS = frozenset({"每日行程", "航班資訊", "出發日期", "費用說明", "注意事項"})
+_ITINERARY_END_PREFIXES = ("注意事項", "出團備註")
+_FREE_DAY_RE = re.compile(r"自由活動|全日自由|自由前往")
+_GUIDED_DAY_RE = re.compile(r"奈良|京都|嵐山|伏見|清水寺")
+# One pass collects every inclusion keyword; 早餐 is last so the longer
+# breakfast phrases win at their position
+_INCLUSION_RE = compile_spaced_keywords(
+    "含團險", "旅行業責任保險", "含國內外機場稅", "含機場稅", "兩地機場稅",
+    "飯店內用", "含早餐", "飯店早餐", "早餐",
+)
+
+
 class SettourParser(BaseScraper):
     source_id = "settour"
 
@@ -43,12 +76,15 @@ class SettourParser(BaseScraper):
     def parse_raw_text(self, raw_text: str, url: str = "", **kwargs) -> ScrapeResult:
         """Parse Settour page text into structured data."""
         result = ScrapeResult(source_id=self.source_id, url=url)
+        # Split once; the line-based helpers share the stripped lines
+        lines = [l.strip() for l in raw_text.split("\n")]
 
-        result.flight = _parse_flights(raw_text)
-        result.hotel = _parse_hotel(raw_text)
+        result.flight = _parse_flights(lines)
+        result.hotel = _parse_hotel(lines, raw_text)
         result.price = _parse_price(raw_text)
         result.dates = _parse_dates(raw_text)
-        result.itinerary = _parse_itinerary(raw_text)
+        if "Day" in raw_text or "DAY" in raw_text or "第" in raw_text:
+            result.itinerary = _parse_itinerary(lines)
         result.inclusions = _parse_inclusions(raw_text)
 
         return result
@@ -58,14 +94,11 @@ class SettourParser(BaseScraper):
 # Pure parsing functions
 # ---------------------------------------------------------------------------
 
-def _parse_flights(raw_text: str) -> FlightInfo:
-    """Parse Settour flight details from raw page text."""
+def _parse_flights(lines: list[str]) -> FlightInfo:
+    """Parse Settour flight details from stripped page lines."""
     flight_info = FlightInfo()
-    lines = raw_text.split("\n")
 
     for i, line in enumerate(lines):
-        line = line.strip()
-
         if line == "去程" and i + 8 < len(lines):
             flight_info.outbound = _parse_flight_block(lines, i)
         elif line == "回程" and i + 8 < len(lines):
@@ -75,17 +108,13 @@ def _parse_flights(raw_text: str) -> FlightInfo:
     # Fallback: scan for flight number patterns
     if not flight_info.outbound.is_populated:
         for i, line in enumerate(lines):
-            line = line.strip()
-            flight_match = re.search(r"([A-Z]{2})\s*(\d{2,4})", line)
-            if flight_match and re.search(
-                r"TPE|NRT|HND|KIX|OSA|NGO",
+            flight_match = _FLIGHT_NO_RE.search(line)
+            if flight_match and _NEARBY_AIRPORT_RE.search(
                 "\n".join(lines[max(0, i - 5) : i + 5]),
             ):
                 nearby = "\n".join(lines[max(0, i - 5) : i + 5])
-                airports = re.findall(
-                    r"(TPE|NRT|HND|KIX|OSA|NGO|CTS|FUK|OKA)", nearby
-                )
-                times = re.findall(r"(\d{2}:\d{2})", nearby)
+                airports = _AIRPORT_RE.findall(nearby)
+                times = _TIME_RE.findall(nearby)
                 if airports and times:
                     target = (
                         flight_info.outbound
@@ -115,7 +144,7 @@ def _parse_flight_block(lines: list[str], start: int) -> FlightSegment:
     text = "\n".join(nearby)
 
     # Date
-    date_match = re.search(r"(\d{4})[/-](\d{1,2})[/-](\d{1,2})", text)
+    date_match = _DATE_RE.search(text)
     if date_match:
         segment.date = (
             f"{date_match.group(1)}/{date_match.group(2).zfill(2)}"
@@ -123,56 +152,49 @@ def _parse_flight_block(lines: list[str], start: int) -> FlightSegment:
         )
 
     # Flight number
-    flight_match = re.search(r"([A-Z]{2})\s*(\d{2,4})", text)
+    flight_match = _FLIGHT_NO_RE.search(text)
     if flight_match:
         segment.flight_number = flight_match.group(1) + flight_match.group(2)
 
     # Airports
-    airports = re.findall(r"(TPE|NRT|HND|KIX|OSA|NGO|CTS|FUK|OKA)", text)
+    airports = _AIRPORT_RE.findall(text)
     if len(airports) >= 2:
         segment.departure_code = airports[0]
         segment.arrival_code = airports[1]
 
     # Times
-    times = re.findall(r"(\d{2}:\d{2})", text)
+    times = _TIME_RE.findall(text)
     if len(times) >= 2:
         segment.departure_time = times[0]
         segment.arrival_time = times[1]
 
     # Airline name
-    airline_match = re.search(
-        r"(中華航空|長榮航空|星宇航空|台灣虎航|樂桃航空|酷航|捷星|亞洲航空)", text
-    )
+    airline_match = _AIRLINE_RE.search(text)
     if airline_match:
         segment.airline = airline_match.group(1)
 
     return segment
 
 
-def _parse_hotel(raw_text: str) -> HotelInfo:
-    """Parse Settour hotel details from raw page text."""
+def _parse_hotel(lines: list[str], raw_text: str) -> HotelInfo:
+    """Parse Settour hotel details from stripped page lines (area from raw_text)."""
     hotel = HotelInfo()
-    lines = raw_text.split("\n")
     in_hotel_section = False
 
     for line in lines:
-        line = line.strip()
-
-        if line in ("飯店安排", "住宿安排", "住宿"):
+        if line in _HOTEL_SECTION_LABELS:
             in_hotel_section = True
             continue
 
         if in_hotel_section and line:
-            if line in ("每日行程", "航班資訊", "出發日期", "費用說明", "注意事項"):
+            if line in _HOTEL_STOP_LABELS:
                 break
 
-            if re.search(
-                r"(Hotel|飯店|酒店|旅館|Inn|Resort|HOTEL)", line, re.IGNORECASE
-            ):
-                names = re.split(r"或\s*同級|或\s*", line)
+            if _HOTEL_RE.search(line):
+                names = _HOTEL_SPLIT_RE.split(line)
                 for name in names:
-                    name = re.sub(r"\s*\([^)]*\)", "", name).strip()
-                    name = re.sub(r"(或同級|同級)", "", name).strip()
+                    name = _PAREN_RE.sub("", name).strip()
+                    name = _SAME_CLASS_RE.sub("", name).strip()
                     if name and len(name) > 2:
                         hotel.names.append(name)
 
@@ -180,11 +202,9 @@ def _parse_hotel(raw_text: str) -> HotelInfo:
         hotel.name = hotel.names[0]
 
     # Extract area
-    for line in raw_text.split("\n"):
-        m = re.search(r"(地區|區域)[:：]\s*(.+)$", line)
-        if m:
-            hotel.area = m.group(2).strip()
-            break
+    m = _AREA_RE.search(raw_text)
+    if m:
+        hotel.area = m.group(2).strip()
 
     return hotel
 
@@ -194,9 +214,7 @@ def _parse_price(raw_text: str) -> PriceInfo:
     price = PriceInfo()
 
     # Pattern: 售價 NT$XX,XXX
-    price_matches = re.findall(
-        r"(?:售價|團費|價格)\s*(?:NT)?\$\s*([\d,]+)", raw_text
-    )
+    price_matches = _PRICE_RE.findall(raw_text)
     if price_matches:
         prices = [int(p.replace(",", "")) for p in price_matches]
         prices = [p for p in prices if p > 10000]
@@ -206,7 +224,7 @@ def _parse_price(raw_text: str) -> PriceInfo:
 
     # Fallback: any NT$ amount > 15000
     if price.per_person is None:
-        all_prices = re.findall(r"NT?\$\s*([\d,]+)", raw_text)
+        all_prices = _NT_RE.findall(raw_text)
         prices = sorted(
             set(
                 int(p.replace(",", ""))
@@ -219,7 +237,7 @@ def _parse_price(raw_text: str) -> PriceInfo:
             price.currency = "TWD"
 
     # Deposit
-    deposit_match = re.search(r"訂金\s*(?:NT)?\$\s*([\d,]+)", raw_text)
+    deposit_match = _DEPOSIT_RE.search(raw_text)
     if deposit_match:
         price.deposit = int(deposit_match.group(1).replace(",", ""))
 
@@ -230,14 +248,12 @@ def _parse_dates(raw_text: str) -> DatesInfo:
     """Parse Settour travel dates from raw page text."""
     dates = DatesInfo()
 
-    duration_match = re.search(r"(\d+)\s*天\s*(\d+)\s*夜", raw_text)
+    duration_match = _DURATION_RE.search(raw_text)
     if duration_match:
         dates.duration_days = int(duration_match.group(1))
         dates.duration_nights = int(duration_match.group(2))
 
-    depart_match = re.search(
-        r"出發日期\s*[:：]?\s*(\d{4})[/-](\d{1,2})[/-](\d{1,2})", raw_text
-    )
+    depart_match = _DEPART_RE.search(raw_text)
     if depart_match:
         dates.year = int(depart_match.group(1))
         dates.departure_month = int(depart_match.group(2))
@@ -246,18 +262,15 @@ def _parse_dates(raw_text: str) -> DatesInfo:
     return dates
 
 
-def _parse_itinerary(raw_text: str) -> list[ItineraryDay]:
-    """Parse daily itinerary from Settour page text."""
+def _parse_itinerary(lines: list[str]) -> list[ItineraryDay]:
+    """Parse daily itinerary from stripped Settour page lines."""
     itinerary: list[ItineraryDay] = []
-    lines = raw_text.split("\n")
 
     current_day = None
     current_content: list[str] = []
 
     for line in lines:
-        line = line.strip()
-
-        day_match = re.match(r"^(?:Day|DAY|第)\s*(\d+)\s*(?:天)?$", line)
+        day_match = _DAY_HEADER_RE.match(line)
         if day_match:
             if current_day is not None:
                 _append_day(itinerary, current_day, current_content)
@@ -266,7 +279,7 @@ def _parse_itinerary(raw_text: str) -> list[ItineraryDay]:
             continue
 
         if current_day is not None:
-            if line.startswith("注意事項") or line.startswith("出團備註"):
+            if line.startswith(_ITINERARY_END_PREFIXES):
                 break
             current_content.append(line)
 
@@ -284,13 +297,8 @@ def _append_day(
         ItineraryDay(
             day=day_num,
             content=content_text[:500],
-            is_free=any(
-                kw in content_text for kw in ["自由活動", "全日自由", "自由前往"]
-            ),
-            is_guided=any(
-                kw in content_text
-                for kw in ["奈良", "京都", "嵐山", "伏見", "清水寺"]
-            ),
+            is_free=bool(_FREE_DAY_RE.search(content_text)),
+            is_guided=bool(_GUIDED_DAY_RE.search(content_text)),
         )
     )
 
@@ -298,15 +306,17 @@ def _append_day(
 def _parse_inclusions(raw_text: str) -> list[str]:
     """Parse inclusions from Settour text."""
     inclusions = []
-    text = raw_text.replace(" ", "")
+    found = {match_keyword(m) for m in _INCLUSION_RE.finditer(raw_text)}
 
-    if "含團險" in text or "旅行業責任保險" in text:
+    if found & {"含團險", "旅行業責任保險"}:
         inclusions.append("travel_insurance")
-    if "含機場稅" in text or "含國內外機場稅" in text or "兩地機場稅" in text:
+    if found & {"含機場稅", "含國內外機場稅", "兩地機場稅"}:
         inclusions.append("airport_tax")
-    if "早餐" in text and (
-        "飯店內用" in text or "含早餐" in text or "飯店早餐" in text
-    ):
+    if found & {"早餐", "含早餐", "飯店早餐"} and found & {
+        "飯店內用",
+        "含早餐",
+        "飯店早餐",
+    }:
         inclusions.append("breakfast")
 
     return inclusions
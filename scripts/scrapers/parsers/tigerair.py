@@ -10,10 +10,18 @@ from __future__ import annotations
 import re
 from datetime import datetime
 
-from ..base import BaseScraper
+from ..base import BaseScraper, save_debug_screenshot
 from ..schema import ScrapeResult, FlightInfo, FlightSegment, PriceInfo
 
 
+# Flight-list patterns, applied per results line
+_FLIGHT_NO_RE = re.compile(r"\b(IT\s*\d{3,4})\b")
+_TIME_RE = re.compile(r"(\d{1,2}:\d{2})")
+# Fare amount after a TWD / NT / NT$ prefix, e.g. "TWD 3,280"
+_PRICE_RE = re.compile(r"(?:TWD|NT\$?)\s*([\d,]+)")
+_DURATION_RE = re.compile(r"(\d+)\s*[hH小時]\s*(\d+)?\s*[mM分]?")
+_DIGIT_LINE_RE = re.compile(r"^[^\n]*\d[^\n]*", re.MULTILINE)
+
 # Tigerair route map — known destinations from TPE
 TIGERAIR_ROUTES = {
     "TPE": {
@@ -67,45 +75,84 @@ class TigerairParser(BaseScraper):
 # Form interaction helpers
 # ---------------------------------------------------------------------------
 
+# Any visible form control means the booking form has rendered
+_FORM_READY_SELECTOR = "input, select, [role='combobox']"
+# Return-date field, shown only in round-trip mode
+_RETURN_DATE_FIELD_SELECTOR = (
+    "[data-field='return-date'], [id*='return'][id*='date'], [class*='return'][class*='date']"
+)
+
+
+async def _click_first(page, tiers, visible_only: bool = False) -> str | None:
+    """
+    Click the first match of the earliest selector tier that matches anything.
+
+    Each tier resolves as one OR'd locator, so the browser checks all of its
+    selectors in a single query and the first match in DOM order wins; put
+    selectors whose order matters in tiers of their own. Returns the tier's
+    selectors, or None.
+    """
+    suffix = " >> visible=true" if visible_only else ""
+    for tier in tiers:
+        loc = page.locator(tier[0] + suffix)
+        for sel in tier[1:]:
+            loc = loc.or_(page.locator(sel + suffix))
+        try:
+            loc = loc.first
+            if not await loc.count():
+                continue
+            await loc.click()
+            return " | ".join(tier)
+        except Exception:
+            continue
+    return None
+
+
 async def fill_search_form(page, origin: str, dest: str, date: str,
                            return_date: str | None = None, pax: int = 2,
-                           lang: str = "zh-TW", debug: bool = False) -> bool:
+                           lang: str = "zh-TW", debug: bool = False,
+                           debug_full: bool = False) -> bool:
     """Fill Tigerair booking search form and submit."""
     booking_url = f"https://booking.tigerairtw.com/{lang}/index"
     print(f"Navigating to: {booking_url}")
 
+    # Analytics beacons keep the network busy, so networkidle rarely fires;
+    # return once the response commits and wait for the SPA's form instead
+    await page.goto(booking_url, wait_until="commit", timeout=15000)
     try:
-        await page.goto(booking_url, wait_until="networkidle", timeout=60000)
+        await page.wait_for_selector(_FORM_READY_SELECTOR, state="visible", timeout=30000)
     except Exception:
-        print("Networkidle timeout, trying domcontentloaded...")
-        await page.goto(booking_url, wait_until="domcontentloaded", timeout=60000)
-
-    await page.wait_for_timeout(3000)
+        print("  Search form not detected, continuing anyway...")
 
     if debug:
-        await page.screenshot(path="/tmp/tigerair-01-loaded.png")
+        await save_debug_screenshot(page, "tigerair-01-loaded", full_page=debug_full)
 
     # Trip type
     trip_type = "roundTrip" if return_date else "oneWay"
+    trip_label = "來回" if return_date else "單程"
     print(f"Setting trip type: {trip_type}")
-    trip_selectors = [
-        f"input[value='{trip_type}']",
-        f"label:has-text('{trip_type}')",
-        f"[data-trip-type='{trip_type}']",
-        f"button:has-text('{'來回' if return_date else '單程'}')",
-        f"label:has-text('{'來回' if return_date else '單程'}')",
-        f"div:has-text('{'來回' if return_date else '單程'}'):not(:has(div))",
-    ]
-    for sel in trip_selectors:
+    # One selector per tier: they overlap (a label can wrap the input, a
+    # generic div can precede the real control), so list order must decide
+    clicked = await _click_first(page, (
+        (f"input[value='{trip_type}']",),
+        (f"label:has-text('{trip_type}')",),
+        (f"[data-trip-type='{trip_type}']",),
+        (f"button:has-text('{trip_label}')",),
+        (f"label:has-text('{trip_label}')",),
+        (f"div:has-text('{trip_label}'):not(:has(div))",),
+    ))
+    if clicked:
+        print(f"  Clicked trip type: {clicked}")
+        # The toggle shows or hides the return-date field; wait for that
+        # instead of a fixed pause (absent field counts as hidden)
         try:
-            el = await page.query_selector(sel)
-            if el:
-                await el.click()
-                print(f"  Clicked trip type: {sel}")
-                await page.wait_for_timeout(500)
-                break
+            await page.wait_for_selector(
+                _RETURN_DATE_FIELD_SELECTOR,
+                state="visible" if return_date else "hidden",
+                timeout=1500,
+            )
         except Exception:
-            continue
+            pass
 
     # Origin
     print(f"Setting origin: {origin}")
@@ -130,33 +177,57 @@ async def fill_search_form(page, origin: str, dest: str, date: str,
         await _try_set_passengers(page, pax)
 
     if debug:
-        await page.screenshot(path="/tmp/tigerair-02-filled.png")
+        await save_debug_screenshot(page, "tigerair-02-filled", full_page=debug_full)
 
     # Submit
     print("Submitting search...")
-    search_selectors = [
-        "button[type='submit']",
-        "button:has-text('搜尋')",
-        "button:has-text('Search')",
-        "button:has-text('查詢')",
-        "[class*='search'] button",
-        "[class*='submit']",
-    ]
-    for sel in search_selectors:
-        try:
-            el = await page.query_selector(sel)
-            if el and await el.is_visible():
-                await el.click()
-                print(f"  Clicked search: {sel}")
-                break
-        except Exception:
-            continue
+    clicked = await _click_first(page, (
+        ("button[type='submit']",),
+        ("button:has-text('搜尋')",),
+        ("button:has-text('Search')",),
+        ("button:has-text('查詢')",),
+        ("[class*='search'] button",),
+        ("[class*='submit']",),
+    ), visible_only=True)
+    if clicked:
+        print(f"  Clicked search: {clicked}")
 
     return True
 
 
-async def extract_flight_results(page, debug: bool = False) -> dict:
-    """Wait for results and extract flight data."""
+# Result cards; each is parsed on its own so banner/promo text can't leak in
+_FLIGHT_CARD_SELECTOR = "[class*='flight-option'], [class*='flight-card'], [class*='flightCard']"
+
+_RESULTS_READY_SELECTOR = (
+    f"{_FLIGHT_CARD_SELECTOR}, [class*='fare'], [class*='no-flight'], [class*='noFlight']"
+)
+
+# Text preview (null = all), only the lines parse_tigerair_flights can use
+# (those with a digit), and the text of each outermost flight card, so the
+# rest of a large page never crosses CDP
+_RESULTS_TEXT_JS = """([limit, cardSelector]) => {
+    const text = document.body.innerText;
+    const cards = Array.from(document.querySelectorAll(cardSelector))
+        .filter((el) => !el.parentElement || !el.parentElement.closest(cardSelector))
+        .map((el) => el.innerText);
+    return [
+        limit === null ? text : text.slice(0, limit),
+        text.split("\\n").filter((line) => /\\p{Nd}/u.test(line)).join("\\n"),
+        cards,
+    ];
+}"""
+
+
+async def extract_flight_results(page, debug: bool = False,
+                                 debug_full: bool = False,
+                                 raw_text_limit: int | None = None) -> dict:
+    """
+    Wait for results and extract flight data.
+
+    raw_text holds the first `raw_text_limit` characters of the page text
+    (all of it when None). Flights are parsed card by card when the results
+    use flight-card markup, otherwise from the full text.
+    """
     print("Waiting for search results...")
 
     try:
@@ -165,43 +236,61 @@ async def extract_flight_results(page, debug: bool = False) -> dict:
     except Exception:
         print("  URL did not change, checking for results on current page...")
 
-    await page.wait_for_timeout(5000)
+    # First result (or empty-state) element, then let late fare requests settle
+    try:
+        await page.wait_for_selector(_RESULTS_READY_SELECTOR, state="visible", timeout=15000)
+        await page.wait_for_load_state("networkidle", timeout=5000)
+    except Exception:
+        pass
 
     if debug:
-        await page.screenshot(path="/tmp/tigerair-03-results.png")
-
-    raw_text = await page.evaluate("() => document.body.innerText")
-    flights = parse_tigerair_flights(raw_text)
+        await save_debug_screenshot(page, "tigerair-03-results", full_page=debug_full)
 
-    return {"raw_text": raw_text, "flights": flights}
+    raw_text, digit_lines, cards = await page.evaluate(
+        _RESULTS_TEXT_JS, [raw_text_limit, _FLIGHT_CARD_SELECTOR]
+    )
+    return {"raw_text": raw_text, "flights": parse_result_flights(cards, digit_lines)}
 
 
 # ---------------------------------------------------------------------------
 # Pure parsing functions
 # ---------------------------------------------------------------------------
 
+def parse_result_flights(cards: list[str], page_text: str) -> list[dict]:
+    """
+    Parse flights from the results page's card texts, one card at a time so
+    banner/promo text can't attach to a neighbouring flight. Falls back to
+    the page text when the cards yield no flights (unrecognized markup).
+    """
+    flights = [f for card in cards for f in parse_tigerair_flights(card)]
+    if not flights:
+        flights = parse_tigerair_flights(page_text)
+    return flights
+
+
 def parse_tigerair_flights(raw_text: str) -> list[dict]:
     """Parse flight options from Tigerair results page text."""
     flights = []
-    lines = raw_text.split("\n")
-    current_flight: dict = {}
+    # The flight being filled in; it is appended when its number is seen and
+    # updated in place, so no per-line "has a flight started" dict lookups
+    current_flight: dict | None = None
 
-    for i, line in enumerate(lines):
-        line = line.strip()
-        if not line:
-            continue
+    # Every field needs a digit, so digit-free lines are skipped inside the
+    # regex scan; substring checks gate each pattern before it runs
+    for m in _DIGIT_LINE_RE.finditer(raw_text):
+        line = m.group()
 
         # Flight number (IT + 3-4 digits)
-        flight_match = re.search(r"\b(IT\s*\d{3,4})\b", line)
+        flight_match = _FLIGHT_NO_RE.search(line) if "IT" in line else None
         if flight_match:
-            if current_flight.get("flight_number"):
-                flights.append(current_flight)
-                current_flight = {}
-            current_flight["flight_number"] = flight_match.group(1).replace(" ", "")
+            current_flight = {"flight_number": flight_match.group(1).replace(" ", "")}
+            flights.append(current_flight)
+        elif current_flight is None:
+            continue
 
         # Time pattern
-        time_match = re.findall(r"(\d{1,2}:\d{2})", line)
-        if time_match and current_flight.get("flight_number"):
+        time_match = _TIME_RE.findall(line) if ":" in line else None
+        if time_match:
             if len(time_match) >= 2 and "departure_time" not in current_flight:
                 current_flight["departure_time"] = time_match[0]
                 current_flight["arrival_time"] = time_match[1]
@@ -211,23 +300,20 @@ def parse_tigerair_flights(raw_text: str) -> list[dict]:
                 current_flight["arrival_time"] = time_match[0]
 
         # Price
-        price_match = re.search(r"(?:TWD|NT\$?)\s*([\d,]+)", line)
-        if price_match and current_flight.get("flight_number"):
+        price_match = _PRICE_RE.search(line) if "NT" in line or "TWD" in line else None
+        if price_match:
             price = int(price_match.group(1).replace(",", ""))
             if price > 500:
                 if "price" not in current_flight or price < current_flight["price"]:
                     current_flight["price"] = price
 
         # Duration
-        dur_match = re.search(r"(\d+)\s*[hH小時]\s*(\d+)?\s*[mM分]?", line)
-        if dur_match and current_flight.get("flight_number"):
+        dur_match = _DURATION_RE.search(line)
+        if dur_match:
             hours = int(dur_match.group(1))
             mins = int(dur_match.group(2) or 0)
             current_flight["duration_minutes"] = hours * 60 + mins
 
-    if current_flight.get("flight_number"):
-        flights.append(current_flight)
-
     return flights
 
 
@@ -235,6 +321,57 @@ def parse_tigerair_flights(raw_text: str) -> list[dict]:
 # Airport / date / passenger helpers
 # ---------------------------------------------------------------------------
 
+# Per selector: true/false whether it matches now, null if the DOM API can't
+# parse it (Playwright-only syntax such as :has-text or text=)
+# Playwright's CSS engine pierces open shadow roots, so the probe searches
+# them too; selectors the browser can't parse (text=, :has-text(), >>) yield
+# null and are left for Playwright to resolve
+_SELECTORS_PRESENT_JS = """(selectors) => {
+    const roots = [document];
+    for (let i = 0; i < roots.length; i++) {
+        for (const el of roots[i].querySelectorAll('*')) {
+            if (el.shadowRoot) roots.push(el.shadowRoot);
+        }
+    }
+    return selectors.map((s) => {
+        try { return roots.some((root) => root.querySelector(s) !== null); }
+        catch (e) { return null; }
+    });
+}"""
+
+# Position of the selector template that last worked, per (field kind, page
+# URL). Origin/destination and departure/return build their lists from the same
+# templates, so the second field of a kind starts with the first one's winner.
+_TEMPLATE_MEMO: dict[tuple[str, str], int] = {}
+
+
+async def _present_selectors(page, selectors: list[str]) -> list[str]:
+    """
+    Drop selectors that match nothing, probing all of them in one round trip.
+
+    Order is kept, and Playwright-only selectors are kept for query_selector
+    to resolve. If the probe rules out every selector, the full list is
+    returned so the caller still tries them all.
+    """
+    try:
+        present = await page.evaluate(_SELECTORS_PRESENT_JS, selectors)
+    except Exception:
+        return list(selectors)
+    kept = [s for s, hit in zip(selectors, present) if hit is not False]
+    return kept or list(selectors)
+
+
+def _memo_first(key: tuple[str, str], selectors: list[str]) -> list[str]:
+    i = _TEMPLATE_MEMO.get(key)
+    if i is None or i >= len(selectors):
+        return selectors
+    return [selectors[i]] + selectors[:i] + selectors[i + 1:]
+
+
+def _remember(key: tuple[str, str], selectors: list[str], hit: str) -> None:
+    _TEMPLATE_MEMO[key] = selectors.index(hit)
+
+
 async def _try_set_airport(page, field: str, code: str) -> bool:
     """Try to set airport in the search form."""
     field_selectors = [
@@ -247,24 +384,31 @@ async def _try_set_airport(page, field: str, code: str) -> bool:
         f"div:has-text('{'出發地' if field == 'origin' else '目的地'}'):not(:has(div))",
     ]
 
-    for sel in field_selectors:
+    field_key = ("airport", page.url)
+    option_key = ("airport-option", page.url)
+    code_templates = [
+        f"text={code}",
+        f"[data-code='{code}']",
+        f"li:has-text('{code}')",
+        f"option[value='{code}']",
+        f"div:has-text('{code}'):not(:has(div:has-text('{code}')))",
+    ]
+    for sel in await _present_selectors(page, _memo_first(field_key, field_selectors)):
         try:
             el = await page.query_selector(sel)
             if el:
                 await el.click()
                 await page.wait_for_timeout(800)
-                code_selectors = [
-                    f"text={code}",
-                    f"[data-code='{code}']",
-                    f"li:has-text('{code}')",
-                    f"option[value='{code}']",
-                    f"div:has-text('{code}'):not(:has(div:has-text('{code}')))",
-                ]
+                code_selectors = await _present_selectors(
+                    page, _memo_first(option_key, code_templates)
+                )
                 for code_sel in code_selectors:
                     try:
                         code_el = await page.query_selector(code_sel)
                         if code_el and await code_el.is_visible():
                             await code_el.click()
+                            _remember(field_key, field_selectors, sel)
+                            _remember(option_key, code_templates, code_sel)
                             print(f"  Selected {field}: {code} via {sel} → {code_sel}")
                             await page.wait_for_timeout(500)
                             return True
@@ -279,7 +423,7 @@ async def _try_set_airport(page, field: str, code: str) -> bool:
         f"input[name*='{field}']",
         f"input[class*='{field}']",
     ]
-    for sel in input_selectors:
+    for sel in await _present_selectors(page, input_selectors):
         try:
             el = await page.query_selector(sel)
             if el:
@@ -307,7 +451,16 @@ async def _try_set_date(page, field: str, date_str: str) -> bool:
         f"div:has-text('{'出發日期' if field == 'departure' else '回程日期'}'):not(:has(div))",
     ]
 
-    for sel in date_field_selectors:
+    field_key = ("date", page.url)
+    day_key = ("date-day", page.url)
+    day_int = int(day)
+    day_templates = [
+        f"[data-date='{date_str}']",
+        f"td[data-day='{day_int}']",
+        f"button:has-text('{day_int}'):not(:has-text('/'))",
+        f"[aria-label*='{date_str}']",
+    ]
+    for sel in await _present_selectors(page, _memo_first(field_key, date_field_selectors)):
         try:
             el = await page.query_selector(sel)
             if el:
@@ -317,18 +470,16 @@ async def _try_set_date(page, field: str, date_str: str) -> bool:
                 target_month = f"{year}-{month}"
                 await _navigate_calendar(page, target_month)
 
-                day_int = int(day)
-                day_selectors = [
-                    f"[data-date='{date_str}']",
-                    f"td[data-day='{day_int}']",
-                    f"button:has-text('{day_int}'):not(:has-text('/'))",
-                    f"[aria-label*='{date_str}']",
-                ]
+                day_selectors = await _present_selectors(
+                    page, _memo_first(day_key, day_templates)
+                )
                 for day_sel in day_selectors:
                     try:
                         day_el = await page.query_selector(day_sel)
                         if day_el and await day_el.is_visible():
                             await day_el.click()
+                            _remember(field_key, date_field_selectors, sel)
+                            _remember(day_key, day_templates, day_sel)
                             print(f"  Selected {field} date: {date_str}")
                             await page.wait_for_timeout(500)
                             return True
@@ -338,7 +489,7 @@ async def _try_set_date(page, field: str, date_str: str) -> bool:
             continue
 
     # Fallback: direct input
-    for sel in [f"input[id*='{field}']", "input[name*='date']"]:
+    for sel in await _present_selectors(page, [f"input[id*='{field}']", "input[name*='date']"]):
         try:
             el = await page.query_selector(sel)
             if el:
@@ -406,12 +557,14 @@ async def _try_set_passengers(page, pax: int) -> bool:
                     "[class*='plus']",
                     "[aria-label='Add adult']",
                 ]
+                plus_key = ("pax-plus", page.url)
                 for _ in range(pax - 1):
-                    for plus_sel in plus_selectors:
+                    for plus_sel in _memo_first(plus_key, plus_selectors):
                         try:
                             plus_el = await page.query_selector(plus_sel)
                             if plus_el and await plus_el.is_visible():
                                 await plus_el.click()
+                                _remember(plus_key, plus_selectors, plus_sel)
                                 await page.wait_for_timeout(200)
                                 break
                         except Exception:
@@ -40,7 +40,9 @@ class Travel4UParser(BaseScraper):
         if code_match:
             result.product_code = code_match.group(1)
 
-        result.flight = _parse_flights(raw_text)
+        # Split once; the line-walking helpers share it
+        lines = raw_text.split("\n")
+        result.flight = _parse_flights(lines)
         result.hotel = _parse_hotel(raw_text)
         result.price = _parse_price(raw_text)
         result.dates = _parse_dates(raw_text)
@@ -49,7 +51,7 @@ class Travel4UParser(BaseScraper):
         result.package_type = _classify_package_type(raw_text, url)
 
         # Extract title
-        result.title = _extract_title(raw_text)
+        result.title = _extract_title(lines)
 
         return result
 
@@ -87,9 +89,8 @@ def build_listing_url(destination: str, departure: str = "taipei") -> str:
 # Pure parsing functions
 # ---------------------------------------------------------------------------
 
-def _extract_title(raw_text: str) -> str:
-    """Extract package title from raw text."""
-    lines = raw_text.split("\n")
+def _extract_title(lines: list[str]) -> str:
+    """Extract package title from the page text lines."""
     for i, line in enumerate(lines):
         line = line.strip()
         # Look for title pattern: "XXX５日－..." or similar
@@ -101,8 +102,8 @@ def _extract_title(raw_text: str) -> str:
     return ""
 
 
-def _parse_flights(raw_text: str) -> FlightInfo:
-    """Parse Travel4U flight details from raw page text."""
+def _parse_flights(lines: list[str]) -> FlightInfo:
+    """Parse Travel4U flight details from the page text lines."""
     flight_info = FlightInfo()
 
     # Map Chinese airports to codes
@@ -134,8 +135,6 @@ def _parse_flights(raw_text: str) -> FlightInfo:
         "亞洲航空": "AK",
     }
 
-    lines = raw_text.split("\n")
-    
     # State for current segment being parsed
     current_day = None
     current_airline = ""
@@ -400,7 +399,7 @@ def parse_listing_item(item_text: str, item_url: str) -> Optional[dict]:
         result["product_code"] = code_match.group(1)
 
     # Extract title (first substantial line)
-    lines = [l.strip() for l in item_text.split("\n") if l.strip()]
+    lines = [l for l in map(str.strip, item_text.split("\n")) if l]
     for line in lines:
         if len(line) > 10 and ("日" in line or "天" in line):
             result["title"] = line[:200]
@@ -0,0 +1,37 @@
+"""
+Tests for scrapers.base — pure text helpers (no browser needed).
+"""
+
+from scrapers.base import compile_spaced_keywords, extract_baggage_info, match_keyword
+
+
+class TestBaggageExtraction:
+    def test_included(self):
+        assert extract_baggage_info("含託運行李 20 公斤") == {"included": True, "kg": 20}
+
+    def test_not_included(self):
+        assert extract_baggage_info("機票不含行李，需另購") == {"included": False, "kg": None}
+
+    def test_unknown(self):
+        assert extract_baggage_info("機加酒自由行") == {"included": None, "kg": None}
+
+    def test_included_beats_not_included(self):
+        text = "促銷票不含行李\n本團含託運行李 23 公斤"
+        assert extract_baggage_info(text) == {"included": True, "kg": 23}
+
+    def test_pattern_order_beats_text_order(self):
+        # "行李 15 kg" comes first in the text, but the 託運行李 pattern is
+        # listed first, so its weight wins
+        text = "手提行李 7 kg 以內\n行李 15 kg\n託運行李 23 公斤"
+        assert extract_baggage_info(text) == {"included": True, "kg": 23}
+
+
+class TestSpacedKeywords:
+    PATTERN = compile_spaced_keywords("含早餐", "機場稅")
+
+    def test_matches_across_spaces(self):
+        hits = [match_keyword(m) for m in self.PATTERN.finditer("本團 含 早 餐，含機場 稅")]
+        assert hits == ["含早餐", "機場稅"]
+
+    def test_no_match_across_newlines(self):
+        assert self.PATTERN.search("含早\n餐 機場\n稅") is None
@@ -4,11 +4,11 @@ Tests for OTA parsers — pure parsing logic (no browser needed).
 Uses real scraped data from data/ as fixtures.
 """
 
-from scrapers.parsers.besttour import BestTourParser
+from scrapers.parsers.besttour import BestTourParser, _parse_hotel, _parse_date_pricing
 from scrapers.parsers.lifetour import LifetourParser
 from scrapers.parsers.settour import SettourParser
 from scrapers.parsers.liontravel import LionTravelParser
-from scrapers.parsers.tigerair import parse_tigerair_flights
+from scrapers.parsers.tigerair import parse_tigerair_flights, parse_result_flights
 from scrapers.parsers.trip_com import (
     parse_nonstop_flights, date_range, add_days, day_of_week, build_oneway_url,
 )
@@ -17,6 +17,7 @@ from scrapers.parsers.google_flights import (
 )
 from scrapers.parsers.agoda import AgodaParser, build_hotel_url, CITY_IDS
 from scrapers.registry import detect_ota, get_parser, get_available_parsers
+from scrapers.schema import ScrapeResult
 
 
 class TestRegistry:
@@ -86,11 +87,97 @@ class TestBestTourParser:
         # BestTour fixture is FIT (機加酒．東京自由行)
         assert result.package_type == "fit"
 
+    def test_reparse_refreshes_parsed_fields(self):
+        parser = BestTourParser()
+        # Simulates a cached scrape whose parsed fields predate a parser change
+        cached = ScrapeResult(
+            source_id="besttour",
+            url="https://www.besttour.com.tw/itinerary/TYO06MM260213AM2",
+            raw_text=(
+                "機加酒．東京自由行\n"
+                "去程\n2026/02/13(五)\nMM620\n樂桃航空\n桃園(TPE)\n06:50\n→\n成田(NRT)\n11:05\n"
+                "13 可售 4 25900\n"
+            ),
+            package_type="unknown",
+        )
+        parser.reparse(cached)
+        assert cached.flight.outbound.flight_number == "MM620"
+        assert cached.flight.outbound.arrival_code == "NRT"
+        assert cached.package_type == "fit"
+        assert cached.date_pricing["2026-02-13"].seats_remaining == 4
+
     def test_source_id(self):
         parser = BestTourParser()
         assert parser.source_id == "besttour"
 
 
+class TestBestTourInlineText:
+    """BestTour helpers on short inline page text (no fixture needed)."""
+
+    def test_hotel_name_skips_meta_and_short_lines(self):
+        hotel = _parse_hotel("住宿\n\n地區：東京\nABC\n  新宿華盛頓飯店  \n其他")
+        assert hotel.name == "新宿華盛頓飯店"
+        assert hotel.area == "東京"
+
+    def test_hotel_name_stops_at_section_heading(self):
+        assert _parse_hotel("住宿\n交通方式\n新宿華盛頓飯店").name == ""
+        # A later hotel heading is still searched
+        assert _parse_hotel("住宿\n行程內容\n說明文字說明\n飯店\n東橫INN上野").name == "東橫INN上野"
+
+    def test_hotel_name_within_24_lines(self):
+        assert _parse_hotel("住宿" + "\n" * 24 + "東橫INN上野").name == "東橫INN上野"
+        assert _parse_hotel("住宿" + "\n" * 25 + "東橫INN上野").name == ""
+
+    def test_hotel_access_lines(self):
+        text = "\n".join(
+            ["JR山手線 新宿站 徒步5分", "JR山手線 新宿站 徒步5分", "地鐵 大江戶線", "jr line 3 min"]
+            + [f"捷運{i}號線 {i}分鐘" for i in range(10)]
+        )
+        access = _parse_hotel(text).access
+        assert access[:2] == ["JR山手線 新宿站 徒步5分", "jr line 3 min"]
+        assert len(access) == 8
+
+    def test_package_type_keywords(self):
+        parser = BestTourParser()
+        assert parser.parse_raw_text("東京5日 機+酒").package_type == "fit"
+        assert parser.parse_raw_text("東京5日 專業導遊").package_type == "group"
+        # FIT keywords are checked first
+        assert parser.parse_raw_text("自由行 領隊說明會").package_type == "fit"
+
+    def test_breakfast_phrases(self):
+        parser = BestTourParser()
+        assert parser.parse_raw_text("飯店附早餐").inclusions == ["light_breakfast"]
+        assert parser.parse_raw_text("早餐自理").inclusions == []
+
+    def test_breakfast_spaced_not_split(self):
+        assert BestTourParser().parse_raw_text("含 早 餐").inclusions == ["light_breakfast"]
+        assert BestTourParser().parse_raw_text("含早\n餐").inclusions == []
+
+    def test_date_pricing_seat_counts(self):
+        pricing = _parse_date_pricing(
+            "2026/03/01 可售 5 25900\n"
+            "2026-03-02 滿團 26900 可售：0\n"
+            "2026/3/3 候補 27900\n"
+        )
+        assert pricing["2026-03-01"].seats_remaining == 5
+        assert pricing["2026-03-01"].availability == "available"
+        assert pricing["2026-03-02"].seats_remaining == 0
+        assert pricing["2026-03-02"].availability == "sold_out"
+        assert pricing["2026-03-03"].seats_remaining is None
+        assert pricing["2026-03-03"].price == 27900
+
+    def test_date_pricing_day_line_fallback(self):
+        text = "三月\n1 可售 3 23900\n 15 候補 24900\n日 一 二"
+        assert _parse_date_pricing(text) == {}
+        pricing = _parse_date_pricing(text, year_month=(2026, 3))
+        assert sorted(pricing) == ["2026-03-01", "2026-03-15"]
+        assert pricing["2026-03-01"].seats_remaining == 3
+        assert pricing["2026-03-15"].availability == "limited"
+        # Full-date rows win over day lines
+        pricing = _parse_date_pricing(text + "\n2026/04/02 可售 22900", year_month=(2026, 3))
+        assert list(pricing) == ["2026-04-02"]
+
+
 class TestLifetourParser:
     def test_parse_flights(self, lifetour_data):
         parser = LifetourParser()
@@ -171,6 +258,31 @@ class TestSettourParser:
         assert isinstance(result.hotel, object)
         assert isinstance(result.inclusions, list)
 
+    def test_itinerary_free_and_guided_days(self):
+        text = "Day 1\n抵達大阪 全日自由\nDay 2\n嵐山 竹林\nDay 3\n心齋橋購物\n注意事項"
+        days = SettourParser().parse_raw_text(text).itinerary
+        assert [(d.day, d.is_free, d.is_guided) for d in days] == [
+            (1, True, False), (2, False, True), (3, False, False),
+        ]
+
+    def test_inclusions_keywords(self):
+        parser = SettourParser()
+        result = parser.parse_raw_text("旅行業責任保險\n含國內外機場稅\n早餐：飯店內用")
+        assert result.inclusions == ["travel_insurance", "airport_tax", "breakfast"]
+        # 早餐 alone (no hotel/含 phrase) is not an included breakfast
+        assert parser.parse_raw_text("早餐自理\n機場稅另計").inclusions == []
+
+    def test_inclusions_spaced_keywords(self):
+        parser = SettourParser()
+        result = parser.parse_raw_text("含 團 險\n飯店 早 餐\n機場\n稅")
+        assert result.inclusions == ["travel_insurance", "breakfast"]
+
+    def test_area_label(self):
+        parser = SettourParser()
+        assert parser.parse_raw_text("飯店\n  地區：大阪  \n注意事項").hotel.area == "大阪"
+        # A label with only trailing spaces gives an empty area; later lines are not used
+        assert parser.parse_raw_text("區域：  \n注意事項\n地區：大阪").hotel.area == ""
+
 
 class TestLionTravelParser:
     def test_parse_search_prices(self, liontravel_data):
@@ -216,6 +328,53 @@ class TestTigerairParser:
         assert flights[0]["flight_number"] == "IT200"
         assert flights[1]["flight_number"] == "IT202"
 
+    def test_parse_fields_on_flight_number_line(self):
+        flights = parse_tigerair_flights("IT 200 10:30 14:00 TWD 3,500 3h 30m")
+        assert flights == [{
+            "flight_number": "IT200",
+            "departure_time": "10:30",
+            "arrival_time": "14:00",
+            "price": 3500,
+            "duration_minutes": 210,
+        }]
+
+    def test_parse_ignores_text_before_first_flight(self):
+        text = "更新於 08:00 09:00\nTWD 9,999\nIT200\n10:30\n14:00"
+        flights = parse_tigerair_flights(text)
+        assert flights == [
+            {"flight_number": "IT200", "departure_time": "10:30", "arrival_time": "14:00"}
+        ]
+
+    def test_parse_price_variants(self):
+        text = "IT200\nTWD 3,500\nNT$3,200\nNT 3,900\nNT$ 400"
+        flights = parse_tigerair_flights(text)
+        # Cheapest fare above 500, whichever prefix it uses
+        assert flights[0]["price"] == 3200
+
+    def test_parse_keeps_flights_without_details(self):
+        text = "IT200\nIT202\n10:30 14:00\nNT$3,500\nIT204"
+        flights = parse_tigerair_flights(text)
+        assert flights == [
+            {"flight_number": "IT200"},
+            {"flight_number": "IT202", "departure_time": "10:30",
+             "arrival_time": "14:00", "price": 3500},
+            {"flight_number": "IT204"},
+        ]
+
+    def test_result_cards_parsed_separately(self):
+        cards = ["IT200\n10:30\n14:00\nTWD 3,500", "IT202\n15:00\n19:00\nTWD 4,200"]
+        # A promo banner between the cards is not part of any card
+        page_text = cards[0] + "\n限時優惠 NT$ 1,999 起\n" + cards[1]
+        assert parse_tigerair_flights(page_text)[0]["price"] == 1999
+        flights = parse_result_flights(cards, page_text)
+        assert [f["price"] for f in flights] == [3500, 4200]
+
+    def test_result_cards_fall_back_to_page_text(self):
+        page_text = "IT200\n10:30\n14:00\nTWD 3,500"
+        for cards in ([], ["會員登入", "限時優惠 NT$ 1,999"]):
+            flights = parse_result_flights(cards, page_text)
+            assert [f["flight_number"] for f in flights] == ["IT200"]
+
 
 class TestTripComParser:
     def test_date_range(self):
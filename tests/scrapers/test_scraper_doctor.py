@@ -0,0 +1,57 @@
+"""
+Tests for scraper_doctor — the static HTTP check (no network or browser needed).
+"""
+
+import asyncio
+
+import scraper_doctor
+
+
+class _Response:
+    status_code = 200
+    text = "<html><body><a href='/itinerary/1'>A</a></body></html>"
+
+
+class _Client:
+    async def get(self, url):
+        return _Response()
+
+
+class _RejectingHTMLParser:
+    """Stands in for selectolax on a selector it can't parse."""
+
+    def __init__(self, html):
+        pass
+
+    def css(self, selector):
+        raise ValueError(f"Unsupported selector: {selector}")
+
+
+class _HTMLParser:
+    def __init__(self, html):
+        self.html = html
+
+    def css(self, selector):
+        return [None] * self.html.count("/itinerary/")
+
+
+CONFIG = {"url": "https://example.com/", "expected_selector": "a", "min_results": 1}
+
+
+class TestCheckOtaHttp:
+    def test_unparsable_selector_falls_through_to_browser(self, monkeypatch):
+        monkeypatch.setattr(scraper_doctor, "HTMLParser", _RejectingHTMLParser, raising=False)
+        config = {**CONFIG, "expected_selector": "div:has-text('交通')"}
+        result = asyncio.run(scraper_doctor.check_ota_http("besttour", config, _Client()))
+        assert result is None
+
+    def test_static_match_is_reachable_not_ok(self, monkeypatch):
+        monkeypatch.setattr(scraper_doctor, "HTMLParser", _HTMLParser, raising=False)
+        result = asyncio.run(scraper_doctor.check_ota_http("besttour", CONFIG, _Client()))
+        assert result["status"] == "reachable"
+        assert result["elements_found"] == 1
+
+    def test_too_few_matches_falls_through(self, monkeypatch):
+        monkeypatch.setattr(scraper_doctor, "HTMLParser", _HTMLParser, raising=False)
+        config = {**CONFIG, "min_results": 5}
+        assert asyncio.run(scraper_doctor.check_ota_http("besttour", config, _Client())) is None